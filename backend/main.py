@@ -2,16 +2,23 @@
 FastAPI backend for syft-simple-runner job history UI
 """
 
+import asyncio
+import hashlib
 import os
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from functools import lru_cache
+from typing import Dict, Any, Callable, List, Optional, Tuple
 from pathlib import Path as PathLib
 
-from fastapi import FastAPI, Depends, HTTPException, Request
+import orjson
+from fastapi import BackgroundTasks, FastAPI, Depends, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse, HTMLResponse
+from fastapi.responses import (
+    JSONResponse, HTMLResponse, ORJSONResponse, Response, StreamingResponse
+)
 from loguru import logger
+from pydantic import BaseModel
 from syft_core import Client
 
 from .models import (
@@ -20,6 +27,7 @@ from .models import (
 )
 from .utils import (
     get_job_history,
+    get_job_by_uid,
     get_job_stats,
     clear_old_job_history
 )
@@ -40,10 +48,16 @@ except ImportError:
         rejected = "rejected"
 
 
+@lru_cache(maxsize=1)
+def _load_client() -> Client:
+    """Load the SyftBox client once; failures are not cached and retry on the next call."""
+    return Client.load()
+
+
 def get_client() -> Client:
     """Get SyftBox client."""
     try:
-        return Client.load()
+        return _load_client()
     except Exception as e:
         logger.error(f"Failed to load SyftBox client: {e}")
         raise HTTPException(status_code=500, detail="SyftBox client not available")
@@ -53,24 +67,55 @@ app = FastAPI(
     title="Syft Simple Runner API",
     description="View execution history and statistics for Syft Simple Runner",
     version="0.2.2",
+    default_response_class=ORJSONResponse,
 )
 
-# Add CORS middleware for development
+# Add CORS middleware. SYFT_CORS_ORIGINS pins an exact comma-separated allowlist;
+# otherwise any local development origin is accepted.
+cors_origins = [o.strip() for o in os.getenv("SYFT_CORS_ORIGINS", "").split(",") if o.strip()]
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[
-        "http://localhost:3000",
-        "http://127.0.0.1:3000",
-        "http://localhost:*",
-        "http://127.0.0.1:*"
-    ],
-    allow_origin_regex=r"http://(localhost|127\.0\.0\.1):\d+",
+    allow_origins=cors_origins,
+    allow_origin_regex=None if cors_origins else r"http://(localhost|127\.0\.0\.1):\d+",
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
 
+# Serialized bodies for polled endpoints: key -> (source object, body, etag).
+# The utils caches return the same object until they refresh, so an identity
+# match means the cached body is still current. Keys include query values, so
+# the cache is cleared when full.
+PAYLOAD_CACHE_SIZE = 64
+_payload_cache: Dict[Tuple[Any, ...], Tuple[Any, bytes, str]] = {}
+
+
+# Serialized single-job payloads: (email, uid, mutable job fields) -> body
+JOB_DETAILS_CACHE_SIZE = 256
+_job_details_cache: Dict[Tuple[Any, ...], bytes] = {}
+
+
+def _cached_json_response(
+    request: Request, key: Tuple[Any, ...], source: Any, build: Callable[[], BaseModel]
+) -> Response:
+    """Serve a JSON body with an ETag, answering 304 when the client's copy is current."""
+    cached = _payload_cache.get(key)
+    if cached and cached[0] is source:
+        body, etag = cached[1], cached[2]
+    else:
+        body = orjson.dumps(build().model_dump(mode="json"))
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        if key not in _payload_cache and len(_payload_cache) >= PAYLOAD_CACHE_SIZE:
+            _payload_cache.clear()
+        _payload_cache[key] = (source, body, etag)
+
+    headers = {"ETag": etag, "Cache-Control": "max-age=5"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
@@ -105,23 +150,45 @@ async def get_status(client: Client = Depends(get_client)) -> StatusResponse:
     description="Get the history of jobs that have been executed by this runner"
 )
 async def get_job_history_endpoint(
+    request: Request,
     limit: int = 50,
     status_filter: Optional[str] = None,
     client: Client = Depends(get_client),
-) -> JobHistoryResponse:
+) -> Response:
     """Get job execution history."""
     try:
-        jobs = get_job_history(client, limit=limit, status_filter=status_filter)
-        return JobHistoryResponse(
-            jobs=jobs,
-            total=len(jobs),
-            status="success"
+        jobs = await asyncio.to_thread(get_job_history, client, limit, status_filter)
+        return _cached_json_response(
+            request,
+            ("history", client.email, limit, status_filter),
+            jobs,
+            lambda: JobHistoryResponse(jobs=jobs, total=len(jobs), status="success"),
         )
     except Exception as e:
         logger.error(f"Failed to get job history: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get(
+    "/api/v1/jobs/history/stream",
+    tags=["jobs"],
+    summary="Stream job execution history",
+    description="Stream the job history as newline-delimited JSON, one job per line"
+)
+async def stream_job_history_endpoint(
+    limit: int = 50,
+    status_filter: Optional[str] = None,
+    client: Client = Depends(get_client),
+) -> StreamingResponse:
+    """Stream job execution history as NDJSON."""
+    def generate():
+        # Sync generator: Starlette iterates it in a worker thread
+        for job in get_job_history(client, limit=limit, status_filter=status_filter):
+            yield orjson.dumps(job.model_dump()) + b"\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
 @app.get(
     "/api/v1/jobs/stats",
     response_model=JobStatsResponse,
@@ -130,12 +197,15 @@ async def get_job_history_endpoint(
     description="Get statistics about job execution performance"
 )
 async def get_job_stats_endpoint(
+    request: Request,
     client: Client = Depends(get_client),
-) -> JobStatsResponse:
+) -> Response:
     """Get job execution statistics."""
     try:
-        stats = get_job_stats(client)
-        return JobStatsResponse(**stats)
+        stats = await asyncio.to_thread(get_job_stats, client)
+        return _cached_json_response(
+            request, ("stats", client.email), stats, lambda: JobStatsResponse(**stats)
+        )
     except Exception as e:
         logger.error(f"Failed to get job stats: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -150,19 +220,27 @@ async def get_job_stats_endpoint(
 async def get_job_details_endpoint(
     job_uid: str,
     client: Client = Depends(get_client),
-) -> Dict[str, Any]:
+) -> Response:
     """Get details for a specific job."""
     try:
-        jobs = get_job_history(client, limit=1000)  # Get more jobs to find the specific one
-        job = next((j for j in jobs if j.uid == job_uid), None)
+        job = await asyncio.to_thread(get_job_by_uid, client, job_uid)
         
         if not job:
             raise HTTPException(status_code=404, detail="Job not found")
-            
-        return {
-            "job": job.dict(),
-            "status": "success"
-        }
+        
+        # The body is reused while every field that a move, a run or a
+        # relabel can change is the same; the rest are fixed at creation
+        key = (
+            client.email, job.uid, job.status, job.success, job.started_at,
+            job.completed_at, job.logs, tuple(job.tags),
+        )
+        body = _job_details_cache.get(key)
+        if body is None:
+            if len(_job_details_cache) >= JOB_DETAILS_CACHE_SIZE:
+                _job_details_cache.clear()
+            body = orjson.dumps({"job": job.model_dump(mode="json"), "status": "success"})
+            _job_details_cache[key] = body
+        return Response(content=body, media_type="application/json")
     except HTTPException:
         raise
     except Exception as e:
@@ -182,8 +260,7 @@ async def get_job_logs_endpoint(
 ) -> Dict[str, Any]:
     """Get logs for a specific job."""
     try:
-        jobs = get_job_history(client, limit=1000)
-        job = next((j for j in jobs if j.uid == job_uid), None)
+        job = await asyncio.to_thread(get_job_by_uid, client, job_uid)
         
         if not job:
             raise HTTPException(status_code=404, detail="Job not found")
@@ -204,49 +281,37 @@ async def get_job_logs_endpoint(
 @app.delete(
     "/api/v1/jobs/history/cleanup",
     response_model=MessageResponse,
+    status_code=202,
     tags=["jobs"],
     summary="Clean up old job history",
-    description="Remove job history older than specified days"
+    description="Schedule removal of job history older than specified days"
 )
 async def cleanup_job_history_endpoint(
+    background_tasks: BackgroundTasks,
     keep_days: int = 30,
     client: Client = Depends(get_client),
 ) -> MessageResponse:
-    """Clean up old job history."""
-    try:
-        count = clear_old_job_history(client, keep_days)
-        return MessageResponse(
-            message=f"Cleaned up {count} old job records",
-            status="success"
-        )
-    except Exception as e:
-        logger.error(f"Failed to cleanup job history: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    """Schedule cleanup of old job history."""
+    background_tasks.add_task(clear_old_job_history, client, keep_days)
+    return MessageResponse(
+        message=f"Cleanup of job records older than {keep_days} days scheduled",
+        status="accepted"
+    )
 
 
-@app.get("/", response_class=HTMLResponse)
-async def root():
-    """Serve the frontend application."""
-    try:
-        # Try to serve the built frontend
-        frontend_path = PathLib(__file__).parent.parent / "frontend" / "out" / "index.html"
-        if frontend_path.exists():
-            return HTMLResponse(content=frontend_path.read_text())
-        else:
-            # Fallback to a simple status page
-            return HTMLResponse(content=f"""
+FALLBACK_HTML = """
             <!DOCTYPE html>
             <html>
             <head>
                 <title>Syft Simple Runner</title>
                 <style>
-                    body {{ font-family: Arial, sans-serif; margin: 40px; background: #f5f5f5; }}
-                    .container {{ max-width: 600px; margin: 0 auto; background: white; padding: 30px; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }}
-                    h1 {{ color: #333; margin-bottom: 20px; }}
-                    .status {{ background: #e8f5e8; padding: 15px; border-radius: 4px; margin: 20px 0; }}
-                    .info {{ background: #e8f4fd; padding: 15px; border-radius: 4px; margin: 20px 0; }}
-                    a {{ color: #0066cc; text-decoration: none; }}
-                    a:hover {{ text-decoration: underline; }}
+                    body { font-family: Arial, sans-serif; margin: 40px; background: #f5f5f5; }
+                    .container { max-width: 600px; margin: 0 auto; background: white; padding: 30px; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }
+                    h1 { color: #333; margin-bottom: 20px; }
+                    .status { background: #e8f5e8; padding: 15px; border-radius: 4px; margin: 20px 0; }
+                    .info { background: #e8f4fd; padding: 15px; border-radius: 4px; margin: 20px 0; }
+                    a { color: #0066cc; text-decoration: none; }
+                    a:hover { text-decoration: underline; }
                 </style>
             </head>
             <body>
@@ -265,7 +330,33 @@ async def root():
                 </div>
             </body>
             </html>
-            """)
+            """.encode()
+FALLBACK_ETAG = hashlib.md5(FALLBACK_HTML).hexdigest()
+
+frontend_index = PathLib(__file__).parent.parent / "frontend" / "out" / "index.html"
+
+
+@lru_cache(maxsize=2)
+def _load_index_page(mtime_ns: int) -> Tuple[bytes, str]:
+    """Read the built frontend index once per file version."""
+    content = frontend_index.read_bytes()
+    return content, hashlib.md5(content).hexdigest()
+
+
+@app.get("/", response_class=HTMLResponse)
+async def root(request: Request):
+    """Serve the frontend application."""
+    try:
+        # Serve the built frontend if present, otherwise a simple status page
+        try:
+            content, etag = _load_index_page(frontend_index.stat().st_mtime_ns)
+        except FileNotFoundError:
+            content, etag = FALLBACK_HTML, FALLBACK_ETAG
+        
+        headers = {"ETag": f'"{etag}"', "Cache-Control": "public, max-age=60"}
+        if request.headers.get("if-none-match") == headers["ETag"]:
+            return Response(status_code=304, headers=headers)
+        return HTMLResponse(content=content, headers=headers)
     except Exception as e:
         logger.error(f"Error serving root: {e}")
         return HTMLResponse(content="<h1>Syft Simple Runner Backend</h1><p>API is running. Frontend not available.</p>")
@@ -15,6 +15,8 @@ class JobHistoryItem(BaseModel):
     created_at: str
     started_at: Optional[str] = None
     completed_at: Optional[str] = None
+    started_ts: Optional[float] = None
+    completed_ts: Optional[float] = None
     execution_time: Optional[float] = None
     success: bool
     logs: Optional[str] = None
@@ -1,10 +1,20 @@
 """Utility functions for syft-simple-runner backend."""
 
-import json
+import heapq
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
+from operator import attrgetter
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set, Tuple
+
+import orjson
 from loguru import logger
+from pydantic import TypeAdapter, ValidationError
 from syft_core import Client
 
 from .models import JobHistoryItem
@@ -25,59 +35,182 @@ except ImportError:
         rejected = "rejected"
 
 
+# Append-only JSON-lines index of every stored history record
+HISTORY_INDEX_FILE = "index.jsonl"
+# Append-only "<created_ts> <uid>" lines, so cleanup can pick expired records
+# without opening them; a uid's last line wins
+HISTORY_EXPIRY_FILE = "cleanup.idx"
+# Threads used when history files have to be read one by one
+HISTORY_READ_WORKERS = 16
+
+# Cache lifetimes in seconds: listings are polled by the UI and should stay fresh,
+# aggregates are cheaper to serve slightly stale.
+HISTORY_CACHE_TTL = 5.0
+STATS_CACHE_TTL = 30.0
+
+# How long a previous syft-code-queue response may be served while the queue is down
+QUEUE_STALE_TOLERANCE = 300.0
+
+# (email, limit, status_filter) -> (fetched_at, items). The key carries query
+# values, so the cache is cleared once it holds HISTORY_CACHE_SIZE entries.
+HISTORY_CACHE_SIZE = 64
+_history_cache: Dict[Tuple[str, int, Optional[str]], Tuple[float, List[JobHistoryItem]]] = {}
+# email -> (fetched_at, {uid: item}), rebuilt from every unfiltered history fetch
+_index_cache: Dict[str, Tuple[float, Dict[str, JobHistoryItem]]] = {}
+# email -> (fetched_at, stats)
+_stats_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+# email -> (fetched_at, raw jobs) from the last successful syft-code-queue call
+_last_good_jobs: Dict[str, Tuple[float, List[Any]]] = {}
+
+# email -> local job history directory
+_history_dirs: Dict[str, Path] = {}
+
+# Serializes every write to the history indexes. Reentrant, since writers
+# that hold it may rebuild a missing index through _read_history_index.
+_cleanup_lock = threading.RLock()
+
+_HISTORY_ADAPTER = TypeAdapter(List[JobHistoryItem])
+
+
+@lru_cache(maxsize=1)
+def _queue_client():
+    """Create the syft-code-queue client once; failures are not cached and retry on the next call."""
+    return create_client()
+
+
+def _history_dir(client: Client) -> Path:
+    """Local job history directory for the client's user, resolved once per user."""
+    history_dir = _history_dirs.get(client.email)
+    if history_dir is None:
+        history_dir = _history_dirs[client.email] = client.app_data("syft-simple-runner") / "job_history"
+    return history_dir
+
+
+def invalidate_job_cache(client: Client) -> None:
+    """Drop all cached history and stats for the client's user."""
+    email = client.email
+    for key in [k for k in _history_cache if k[0] == email]:
+        _history_cache.pop(key, None)
+    _index_cache.pop(email, None)
+    _stats_cache.pop(email, None)
+
+
 def get_job_history(client: Client, limit: int = 50, status_filter: Optional[str] = None) -> List[JobHistoryItem]:
+    """Get job execution history, served from a short-lived cache when possible."""
+    key = (client.email, limit, status_filter)
+    cached = _history_cache.get(key)
+    if cached and time.monotonic() - cached[0] < HISTORY_CACHE_TTL:
+        return cached[1]
+
+    try:
+        history_items = _fetch_job_history(client, limit, status_filter)
+    except Exception as e:
+        if cached:
+            logger.warning(f"Serving stale job history after fetch failure: {e}")
+            return cached[1]
+        logger.error(f"Error getting job history: {e}")
+        return []
+
+    fetched_at = time.monotonic()
+    if key not in _history_cache and len(_history_cache) >= HISTORY_CACHE_SIZE:
+        _history_cache.clear()
+    _history_cache[key] = (fetched_at, history_items)
+    if status_filter is None:
+        _index_cache[client.email] = (fetched_at, {item.uid: item for item in history_items})
+    return history_items
+
+
+def get_job_by_uid(client: Client, job_uid: str) -> Optional[JobHistoryItem]:
+    """Get a single job by uid without materializing the full history."""
+    # The index is only as fresh as the listing it came from
+    cached = _index_cache.get(client.email)
+    if cached and time.monotonic() - cached[0] < HISTORY_CACHE_TTL and job_uid in cached[1]:
+        return cached[1][job_uid]
+
+    if q and create_client:
+        try:
+            queue_client = _queue_client()
+            if hasattr(queue_client, 'get_job'):
+                job = queue_client.get_job(job_uid)
+                # get_job finds any job; only those targeted at this user are theirs to see
+                if job is not None and getattr(job, 'target_email', None) != client.email:
+                    return None
+            else:
+                job = next(
+                    (j for j in queue_client.list_jobs(target_email=client.email) if str(j.uid) == job_uid),
+                    None
+                )
+            if job is not None:
+                return _to_history_item(job)
+        except Exception as e:
+            logger.warning(f"Failed to get job {job_uid} from syft-code-queue: {e}")
+
+    # Fallback: read the single local history record
+    try:
+        job_file = _history_dir(client) / f"{job_uid}.json"
+        if job_file.exists():
+            return JobHistoryItem(**orjson.loads(job_file.read_bytes()))
+    except Exception as e:
+        logger.warning(f"Failed to read job history for {job_uid}: {e}")
+    return None
+
+
+def _to_history_item(job: Any) -> JobHistoryItem:
+    """Convert a syft-code-queue job into a JobHistoryItem."""
+    # Use numeric timestamps when the job carries them, otherwise parse once
+    started_ts = getattr(job, 'started_ts', None)
+    if started_ts is None:
+        started_ts = _to_timestamp(getattr(job, 'started_at', None))
+    completed_ts = getattr(job, 'completed_ts', None)
+    if completed_ts is None:
+        completed_ts = _to_timestamp(getattr(job, 'completed_at', None))
+    
+    # Calculate execution time if possible
+    execution_time = None
+    if started_ts is not None and completed_ts is not None:
+        execution_time = completed_ts - started_ts
+    
+    # Determine success status
+    success = job.status.value == JobStatus.completed
+    
+    # Get logs if available
+    logs = getattr(job, 'logs', None) or "No logs available"
+    
+    return JobHistoryItem(
+        uid=job.uid,
+        name=job.name,
+        status=job.status.value,
+        requester_email=job.requester_email,
+        target_email=job.target_email,
+        created_at=job.created_at,
+        started_at=getattr(job, 'started_at', None),
+        completed_at=getattr(job, 'completed_at', None),
+        started_ts=started_ts,
+        completed_ts=completed_ts,
+        execution_time=execution_time,
+        success=success,
+        logs=logs,
+        tags=getattr(job, 'tags', [])
+    )
+
+
+def _fetch_job_history(client: Client, limit: int = 50, status_filter: Optional[str] = None) -> List[JobHistoryItem]:
     """Get job execution history from the syft-code-queue."""
     try:
         # Try to get jobs from syft-code-queue
         if q and create_client:
             try:
-                queue_client = create_client()
                 # Get jobs for this user
-                all_jobs = queue_client.list_jobs(target_email=client.email)
+                all_jobs = _list_queue_jobs(client)
                 
-                # Filter and convert to JobHistoryItem
-                history_items = []
-                for job in all_jobs:
-                    # Apply status filter if provided
-                    if status_filter and job.status.value != status_filter:
-                        continue
-                    
-                    # Calculate execution time if possible
-                    execution_time = None
-                    if hasattr(job, 'started_at') and hasattr(job, 'completed_at'):
-                        if job.started_at and job.completed_at:
-                            try:
-                                start = datetime.fromisoformat(job.started_at.replace('Z', '+00:00'))
-                                end = datetime.fromisoformat(job.completed_at.replace('Z', '+00:00'))
-                                execution_time = (end - start).total_seconds()
-                            except:
-                                pass
-                    
-                    # Determine success status
-                    success = job.status.value == JobStatus.completed
-                    
-                    # Get logs if available
-                    logs = getattr(job, 'logs', None) or "No logs available"
-                    
-                    history_item = JobHistoryItem(
-                        uid=job.uid,
-                        name=job.name,
-                        status=job.status.value,
-                        requester_email=job.requester_email,
-                        target_email=job.target_email,
-                        created_at=job.created_at,
-                        started_at=getattr(job, 'started_at', None),
-                        completed_at=getattr(job, 'completed_at', None),
-                        execution_time=execution_time,
-                        success=success,
-                        logs=logs,
-                        tags=getattr(job, 'tags', [])
-                    )
-                    history_items.append(history_item)
+                # Apply status filter if provided, before any conversion work
+                if status_filter:
+                    all_jobs = [job for job in all_jobs if job.status.value == status_filter]
                 
-                # Sort by created_at descending and limit
-                history_items.sort(key=lambda x: x.created_at, reverse=True)
-                return history_items[:limit]
+                # Select the newest `limit` jobs first so only those are converted
+                newest = heapq.nlargest(limit, all_jobs, key=attrgetter('created_at'))
+                return [_to_history_item(job) for job in newest]
                 
             except Exception as e:
                 logger.warning(f"Failed to get jobs from syft-code-queue: {e}")
@@ -87,61 +220,188 @@ def get_job_history(client: Client, limit: int = 50, status_filter: Optional[str
         
     except Exception as e:
         logger.error(f"Error getting job history: {e}")
-        return []
+        raise
+
+
+def _list_queue_jobs(client: Client) -> List[Any]:
+    """List the user's jobs from syft-code-queue, tolerating short queue outages.
+    
+    The last successful response is kept per user; if the queue fails and that
+    copy is younger than QUEUE_STALE_TOLERANCE it is served instead.
+    """
+    try:
+        queue_client = _queue_client()
+        all_jobs = queue_client.list_jobs(target_email=client.email)
+    except Exception as e:
+        last_good = _last_good_jobs.get(client.email)
+        if last_good and time.monotonic() - last_good[0] < QUEUE_STALE_TOLERANCE:
+            logger.warning(f"syft-code-queue unavailable, serving stale job list: {e}")
+            return last_good[1]
+        raise
+    
+    _last_good_jobs[client.email] = (time.monotonic(), all_jobs)
+    return all_jobs
+
+
+def _to_timestamp(value: Any) -> Optional[float]:
+    """Convert an ISO-8601 string or datetime into epoch seconds."""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    try:
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        return value.timestamp()
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def _created_at_key(record: Dict[str, Any]) -> str:
+    """Sort key for raw history records."""
+    return record.get('created_at', '')
 
 
 def _get_local_job_history(client: Client, limit: int = 50, status_filter: Optional[str] = None) -> List[JobHistoryItem]:
     """Get job history from local storage as fallback."""
     try:
-        # Get the app data directory
-        app_data_dir = client.app_data("syft-simple-runner")
-        history_dir = app_data_dir / "job_history"
+        history_dir = _history_dir(client)
         
         if not history_dir.exists():
             return []
         
-        history_items = []
-        
-        # Read all job history files
-        for job_file in history_dir.glob("*.json"):
-            try:
-                with open(job_file, 'r') as f:
-                    job_data = json.load(f)
-                
-                # Apply status filter if provided
-                if status_filter and job_data.get('status') != status_filter:
-                    continue
-                
-                history_item = JobHistoryItem(**job_data)
-                history_items.append(history_item)
-                
-            except Exception as e:
-                logger.warning(f"Failed to read job history file {job_file}: {e}")
-                continue
-        
-        # Sort by created_at descending and limit
-        history_items.sort(key=lambda x: x.created_at, reverse=True)
-        return history_items[:limit]
+        # History files are replaced atomically, so the directory mtime changes
+        # whenever a record is added, updated or removed.
+        dir_mtime_ns = history_dir.stat().st_mtime_ns
+        return list(_load_history_cached(str(history_dir), dir_mtime_ns, limit, status_filter))
         
     except Exception as e:
         logger.error(f"Error getting local job history: {e}")
         return []
 
 
+@lru_cache(maxsize=64)
+def _load_history_cached(
+    history_dir: str, dir_mtime_ns: int, limit: int, status_filter: Optional[str]
+) -> Tuple[JobHistoryItem, ...]:
+    """Load job history records, memoized on the history directory's mtime."""
+    records = _read_history_index(Path(history_dir))
+    
+    # Apply status filter during the scan and keep only the newest `limit` rows
+    if status_filter:
+        records = [r for r in records if r.get('status') == status_filter]
+    newest = heapq.nlargest(limit, records, key=_created_at_key)
+    
+    # Validate the whole batch in one pydantic-core call; only fall back to
+    # per-record validation to skip the bad rows when the batch fails
+    try:
+        return tuple(_HISTORY_ADAPTER.validate_python(newest))
+    except ValidationError:
+        pass
+    
+    history_items = []
+    for job_data in newest:
+        try:
+            history_items.append(JobHistoryItem.model_validate(job_data))
+        except ValidationError as e:
+            logger.warning(f"Invalid job history record {job_data.get('uid')}: {e}")
+    return tuple(history_items)
+
+
+def _read_history_index(history_dir: Path) -> List[Dict[str, Any]]:
+    """Read the latest record per job from the history index.
+    
+    The index is append-only, so later lines for the same uid supersede
+    earlier ones. If no index exists yet it is rebuilt from the per-job files.
+    """
+    index_file = history_dir / HISTORY_INDEX_FILE
+    if not index_file.exists():
+        # Readers run concurrently, so the rebuild takes the writers' lock;
+        # another reader or a store may have written the index meanwhile
+        with _cleanup_lock:
+            if not index_file.exists():
+                # Per-file reads are latency-bound, so overlap them across threads
+                job_files = list(history_dir.glob("*.json"))
+                with ThreadPoolExecutor(max_workers=HISTORY_READ_WORKERS) as pool:
+                    records = [r for r in pool.map(_read_history_file, job_files) if r is not None]
+                _write_history_index(history_dir, records)
+                return records
+    
+    latest: Dict[str, Dict[str, Any]] = {}
+    with open(index_file, 'rb') as f:
+        for line in f:
+            try:
+                job_data = orjson.loads(line)
+                latest[job_data['uid']] = job_data
+            except Exception:
+                continue
+    return list(latest.values())
+
+
+def _read_history_file(job_file: Path) -> Optional[Dict[str, Any]]:
+    """Read a single job history file, returning None if it can't be parsed."""
+    try:
+        return orjson.loads(job_file.read_bytes())
+    except Exception as e:
+        logger.warning(f"Failed to read job history file {job_file}: {e}")
+        return None
+
+
+def _write_history_index(history_dir: Path, records: List[Dict[str, Any]]) -> None:
+    """Atomically rewrite the history index with the given records."""
+    index_file = history_dir / HISTORY_INDEX_FILE
+    tmp_file = index_file.with_suffix(".jsonl.tmp")
+    with open(tmp_file, 'wb') as f:
+        for job_data in records:
+            f.write(orjson.dumps(job_data) + b"\n")
+    os.replace(tmp_file, index_file)
+
+
 def store_job_history(client: Client, job_data: Dict[str, Any]) -> bool:
     """Store job execution history locally."""
     try:
-        # Get the app data directory
-        app_data_dir = client.app_data("syft-simple-runner")
-        history_dir = app_data_dir / "job_history"
+        history_dir = _history_dir(client)
         history_dir.mkdir(parents=True, exist_ok=True)
         
-        # Create history file
+        # Precompute numeric timestamps once so readers never parse dates
+        job_data = dict(job_data)
+        if job_data.get('started_ts') is None:
+            job_data['started_ts'] = _to_timestamp(job_data.get('started_at'))
+        if job_data.get('completed_ts') is None:
+            job_data['completed_ts'] = _to_timestamp(job_data.get('completed_at'))
+        if job_data.get('execution_time') is None and None not in (
+            job_data['started_ts'], job_data['completed_ts']
+        ):
+            job_data['execution_time'] = job_data['completed_ts'] - job_data['started_ts']
+        
+        # Create history file, writing to a temp file first so readers never
+        # see a partial record and the directory mtime reflects the update
         job_file = history_dir / f"{job_data['uid']}.json"
+        tmp_file = job_file.with_suffix(".json.tmp")
+        
+        tmp_file.write_bytes(orjson.dumps(job_data, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_file, job_file)
         
-        with open(job_file, 'w') as f:
-            json.dump(job_data, f, indent=2)
+        # Append to the index so readers don't need to open every file, and
+        # to the expiry index so cleanup doesn't either. The lock keeps these
+        # appends from landing in a file that cleanup is replacing.
+        with _cleanup_lock:
+            if (history_dir / HISTORY_INDEX_FILE).exists():
+                with open(history_dir / HISTORY_INDEX_FILE, 'ab') as f:
+                    f.write(orjson.dumps(job_data) + b"\n")
+            else:
+                # First record since upgrading: build the index from every
+                # per-job file (this one included) rather than starting an
+                # index that would hide the older records
+                _read_history_index(history_dir)
+            if (history_dir / HISTORY_EXPIRY_FILE).exists():
+                with open(history_dir / HISTORY_EXPIRY_FILE, 'ab') as f:
+                    f.write(_expiry_line(job_data['uid'], _expiry_ts(job_data)))
+            else:
+                # Likewise seed the expiry index from a full scan, so records
+                # from before the upgrade still expire
+                _, lines = _scan_expired_files(history_dir, float("-inf"))
+                _write_expiry_index(history_dir, lines)
         
+        invalidate_job_cache(client)
         logger.debug(f"Stored job history for {job_data['uid']}")
         return True
         
@@ -150,20 +410,58 @@ def store_job_history(client: Client, job_data: Dict[str, Any]) -> bool:
         return False
 
 
+def _get_job_statuses(client: Client, limit: int = 1000) -> List[Tuple[bool, str]]:
+    """Get (success, status) pairs for the newest jobs without building history items."""
+    if q and create_client:
+        try:
+            all_jobs = _list_queue_jobs(client)
+            newest = heapq.nlargest(limit, all_jobs, key=attrgetter('created_at'))
+            return [
+                (job.status.value == JobStatus.completed, job.status.value) for job in newest
+            ]
+        except Exception as e:
+            logger.warning(f"Failed to get jobs from syft-code-queue: {e}")
+    
+    history_dir = _history_dir(client)
+    if not history_dir.exists():
+        return []
+    return list(_load_statuses_cached(str(history_dir), history_dir.stat().st_mtime_ns, limit))
+
+
+@lru_cache(maxsize=8)
+def _load_statuses_cached(history_dir: str, dir_mtime_ns: int, limit: int) -> Tuple[Tuple[bool, str], ...]:
+    """Project the history index down to status fields, memoized on the directory mtime."""
+    records = _read_history_index(Path(history_dir))
+    newest = heapq.nlargest(limit, records, key=_created_at_key)
+    return tuple((bool(r.get('success')), r.get('status', '')) for r in newest)
+
+
 def get_job_stats(client: Client) -> Dict[str, Any]:
     """Get job execution statistics."""
+    cached = _stats_cache.get(client.email)
+    if cached and time.monotonic() - cached[0] < STATS_CACHE_TTL:
+        return cached[1]
+
     try:
-        jobs = get_job_history(client, limit=1000)  # Get more jobs for stats
+        statuses = _get_job_statuses(client, limit=1000)  # Get more jobs for stats
+        
+        total_jobs = len(statuses)
+        successful_jobs = failed_jobs = running_jobs = pending_jobs = 0
         
-        total_jobs = len(jobs)
-        successful_jobs = len([j for j in jobs if j.success])
-        failed_jobs = len([j for j in jobs if not j.success and j.status not in ['pending', 'running']])
-        running_jobs = len([j for j in jobs if j.status == 'running'])
-        pending_jobs = len([j for j in jobs if j.status == 'pending'])
+        # Tally distinct (success, status) pairs in C, then fold the few buckets
+        for (success, status), count in Counter(statuses).items():
+            if success:
+                successful_jobs += count
+            elif status == 'running':
+                running_jobs += count
+            elif status == 'pending':
+                pending_jobs += count
+            else:
+                failed_jobs += count
         
         success_rate = (successful_jobs / total_jobs * 100) if total_jobs > 0 else 0.0
         
-        return {
+        stats = {
             "total_jobs": total_jobs,
             "successful_jobs": successful_jobs,
             "failed_jobs": failed_jobs,
@@ -172,9 +470,13 @@ def get_job_stats(client: Client) -> Dict[str, Any]:
             "success_rate": round(success_rate, 2),
             "status": "success"
         }
+        _stats_cache[client.email] = (time.monotonic(), stats)
+        return stats
         
     except Exception as e:
         logger.error(f"Error getting job stats: {e}")
+        if cached:
+            return cached[1]
         return {
             "total_jobs": 0,
             "successful_jobs": 0,
@@ -188,39 +490,131 @@ def get_job_stats(client: Client) -> Dict[str, Any]:
 
 def clear_old_job_history(client: Client, keep_days: int = 30) -> int:
     """Clear old job history records."""
+    # Cleanups run as background tasks; serialize them so index rewrites don't race
+    with _cleanup_lock:
+        return _clear_old_job_history(client, keep_days)
+
+
+def _clear_old_job_history(client: Client, keep_days: int) -> int:
     try:
         cutoff_date = datetime.now() - timedelta(days=keep_days)
         
-        # Get the app data directory
-        app_data_dir = client.app_data("syft-simple-runner")
-        history_dir = app_data_dir / "job_history"
+        history_dir = _history_dir(client)
         
         if not history_dir.exists():
             return 0
         
-        cleaned_count = 0
+        cutoff_ts = cutoff_date.timestamp()
+        
+        # The expiry index names exactly the records created before the cutoff;
+        # without one (older installs), fall back to scanning the files once
+        expiry_file = history_dir / HISTORY_EXPIRY_FILE
+        if expiry_file.exists():
+            expired_uids, remaining = _split_expiry_index(expiry_file, cutoff_ts)
+        else:
+            expired_uids, remaining = _scan_expired_files(history_dir, cutoff_ts)
         
-        # Check each job history file
-        for job_file in history_dir.glob("*.json"):
+        cleaned_count = 0
+        cleaned_uids = set()
+        for uid in expired_uids:
             try:
-                with open(job_file, 'r') as f:
-                    job_data = json.load(f)
-                
-                # Parse the created_at date
-                created_at = datetime.fromisoformat(job_data['created_at'].replace('Z', '+00:00'))
-                
-                # Remove if older than cutoff
-                if created_at < cutoff_date:
-                    job_file.unlink()
-                    cleaned_count += 1
-                    logger.debug(f"Cleaned up old job history: {job_data['uid']}")
-                    
+                (history_dir / f"{uid}.json").unlink()
+            except FileNotFoundError:
+                continue
             except Exception as e:
-                logger.warning(f"Failed to process job history file {job_file}: {e}")
+                logger.warning(f"Failed to remove job history file for {uid}: {e}")
                 continue
+            cleaned_count += 1
+            cleaned_uids.add(uid)
+            logger.debug(f"Cleaned up old job history: {uid}")
         
+        if expired_uids or not expiry_file.exists():
+            _write_expiry_index(history_dir, remaining)
+        
+        if cleaned_count:
+            records = _read_history_index(history_dir)
+            _write_history_index(
+                history_dir, [r for r in records if r.get('uid') not in cleaned_uids]
+            )
+            invalidate_job_cache(client)
         return cleaned_count
         
     except Exception as e:
         logger.error(f"Error clearing old job history: {e}")
-        return 0 
\ No newline at end of file
+        return 0
+
+
+def _expiry_ts(job_data: Dict[str, Any]) -> float:
+    """Time a record expires from: its creation, or now if that can't be read."""
+    created_ts = _to_timestamp(job_data.get('created_at'))
+    return time.time() if created_ts is None else created_ts
+
+
+def _expiry_line(uid: str, created_ts: float) -> bytes:
+    return f"{created_ts:.3f} {uid}\n".encode()
+
+
+def _split_expiry_index(expiry_file: Path, cutoff_ts: float) -> Tuple[Set[str], List[bytes]]:
+    """Split the expiry index into uids created before the cutoff and the lines to keep."""
+    latest: Dict[bytes, float] = {}
+    with open(expiry_file, 'rb') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) != 2:
+                continue
+            try:
+                latest[parts[1]] = float(parts[0])
+            except ValueError:
+                continue
+    
+    expired = {uid.decode() for uid, created_ts in latest.items() if created_ts < cutoff_ts}
+    remaining = [
+        _expiry_line(uid.decode(), created_ts)
+        for uid, created_ts in latest.items() if created_ts >= cutoff_ts
+    ]
+    return expired, remaining
+
+
+def _scan_expired_files(history_dir: Path, cutoff_ts: float) -> Tuple[Set[str], List[bytes]]:
+    """
+    Find records created before the cutoff and build expiry lines for the rest.
+    
+    A record is written after it is created, so a file last modified before
+    the cutoff is expired without being read. Any other file may still hold
+    an old record and is parsed to check its created_at.
+    """
+    expired = set()
+    kept = []
+    with os.scandir(history_dir) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                modified_at = entry.stat().st_mtime
+            except OSError:
+                continue
+            uid = entry.name[:-len(".json")]
+            if modified_at < cutoff_ts:
+                expired.add(uid)
+                continue
+            
+            job_data = _read_history_file(Path(entry.path))
+            created_ts = _to_timestamp(job_data.get('created_at')) if job_data else None
+            if created_ts is None:
+                # Unreadable records are left alone, as before
+                kept.append((modified_at, uid))
+            elif created_ts < cutoff_ts:
+                expired.add(uid)
+            else:
+                kept.append((created_ts, uid))
+    kept.sort()
+    return expired, [_expiry_line(uid, created_ts) for created_ts, uid in kept]
+
+
+def _write_expiry_index(history_dir: Path, lines: List[bytes]) -> None:
+    """Atomically rewrite the expiry index with the given lines."""
+    expiry_file = history_dir / HISTORY_EXPIRY_FILE
+    tmp_file = expiry_file.with_suffix(".idx.tmp")
+    with open(tmp_file, 'wb') as f:
+        f.writelines(lines)
+    os.replace(tmp_file, expiry_file) 
\ No newline at end of file
@@ -5,16 +5,23 @@ Syft Simple Runner App - SyftBox Integration
 This module runs as a SyftBox app, continuously polling for approved code execution jobs.
 """
 
+import mmap
+import os
+import re
+import selectors
+import signal
+import tempfile
 import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from itertools import islice
 from pathlib import Path
 from loguru import logger
 from datetime import datetime
-import signal
-import sys
 from time import sleep
-from typing import Optional
+from typing import Dict, List, Optional
+from uuid import UUID
 
-from .syft_queue import Job, JobStatus, Queue, q
+from .syft_queue import Job, JobStatus, JobView, q
 
 try:
     from syft_core import Client as SyftBoxClient
@@ -26,7 +33,6 @@ except ImportError:
             self.email = "demo@example.com"
         
         def app_data(self, app_name):
-            import tempfile
             return Path(tempfile.gettempdir()) / f"syftbox_demo_{app_name}"
         
         @classmethod
@@ -35,14 +41,77 @@ except ImportError:
     
     SyftBoxClient = MockSyftBoxClient
 
-from .runner import run_job
+from .runner import run_job, terminate_running_jobs
+
+
+# Statuses whose directories are watched for changes between cycles
+WATCHED_STATUSES = [JobStatus.inbox, JobStatus.approved, JobStatus.running]
+
+# Seconds between cycles that run even when the queue hasn't changed, so
+# jobs can still be timed out
+TIMEOUT_CHECK_INTERVAL = 60
+
+# Default number of jobs executed at the same time
+MAX_CONCURRENT_JOBS = 3
+
+# Commands a submitted script may not contain
+DANGEROUS_COMMANDS = [
+    "rm -rf",
+    "sudo",
+    "> /dev/null",
+    "2>&1",
+    "wget",
+    "curl",
+    "nc",
+    "netcat",
+]
+
+
+def _command_pattern(cmd: str) -> bytes:
+    """
+    Regex for one blocked command.
+
+    A command starting with a word character must start a word; a bare
+    command name must also end one, apart from version suffixes (wget2).
+    Multi-word entries stay open-ended so "rm -rf" still catches "rm -rfv".
+    """
+    pattern = re.escape(cmd.encode())
+    if re.match(r"\w", cmd[0]):
+        pattern = rb"(?<![A-Za-z0-9_])" + pattern
+    if re.fullmatch(r"\w+", cmd):
+        pattern = pattern + rb"(?![A-Za-z_])"
+    return pattern
+
+
+# One pass over the raw script bytes finds any of them. Boundaries keep short
+# names like "nc" from matching inside words such as "sync" or "function".
+_DANGEROUS_RE = re.compile(b"|".join(map(_command_pattern, DANGEROUS_COMMANDS)), re.IGNORECASE)
+
+# Scripts at least this large are scanned through mmap instead of being read
+MMAP_SCAN_THRESHOLD = 4096
 
 
 class SimpleRunnerApp:
     """Simple app that polls for and executes code jobs."""
     
-    def __init__(self, queue_name: str = "code-queue"):
+    def __init__(self, queue_name: str = "code-queue", max_concurrent_jobs: int = MAX_CONCURRENT_JOBS):
         """Initialize the app."""
+        # Each job spends its time waiting on a subprocess, so threads are
+        # enough to run several at once
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrent_jobs, thread_name_prefix="job"
+        )
+        self._inflight: Dict[UUID, Future] = {}
+
+        # Status moves made by the dispatcher are written in the background;
+        # the cycle waits for them once at the end instead of once per job
+        self._save_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="save")
+        self._pending_saves: List[Future] = []
+        
+        # Pending job uids last reported, so an unchanged inbox isn't re-logged
+        self._last_pending: Optional[frozenset] = None
+
         try:
             self.syftbox_client = SyftBoxClient.load()
             email = self.syftbox_client.email
@@ -65,68 +134,214 @@ class SimpleRunnerApp:
         """
         Start continuous job polling and execution.
 
+        Runs until interrupted or sent SIGTERM, then stops running jobs.
+
         Args:
             poll_interval: Seconds between polling cycles
         """
         logger.info(f"🔄 Starting continuous job polling (every {poll_interval} second)...")
         
+        self._running = True
+        wakeup = self._install_signal_handlers()
+        
         cycle = 0
-        while True:
-            try:
-                # Process one cycle
-                self._process_cycle()
-                cycle += 1
+        last_signature = None
+        last_full_cycle = float("-inf")
+        try:
+            while self._running:
+                try:
+                    # Only process when a job entered or left a watched status, or
+                    # when the periodic timeout check is due; idle ticks cost a few stats
+                    signature = self.queue.status_signature(WATCHED_STATUSES)
+                    now = time.monotonic()
+                    if signature != last_signature or now - last_full_cycle >= TIMEOUT_CHECK_INTERVAL:
+                        self._process_cycle()
+                        last_signature = signature
+                        last_full_cycle = now
+                    cycle += 1
+                except KeyboardInterrupt:
+                    break
+                except Exception as e:
+                    logger.error(f"Error in processing cycle {cycle}: {e}")
+                    # Continue running despite errors
                 
                 # Sleep until next cycle
-                sleep(poll_interval)
-            
-            except KeyboardInterrupt:
-                logger.info("👋 Shutting down...")
-                break
-            except Exception as e:
-                logger.error(f"Error in processing cycle {cycle}: {e}")
-                # Continue running despite errors
-                sleep(poll_interval)
+                try:
+                    self._sleep(poll_interval, wakeup)
+                except KeyboardInterrupt:
+                    break
+        finally:
+            logger.info("👋 Shutting down...")
+            self._remove_signal_handlers(wakeup)
+            self.shutdown(stop_jobs=True)
+    
+    def _install_signal_handlers(self) -> Optional[selectors.BaseSelector]:
+        """
+        Stop the polling loop on SIGTERM, waking it as soon as a signal arrives.
+
+        Returns a selector watching the signal wakeup pipe, or None when
+        signals can't be set up (only the main thread may install handlers).
+        """
+        try:
+            self._previous_sigterm = signal.signal(signal.SIGTERM, self._handle_stop_signal)
+        except ValueError:
+            return None
+        
+        read_fd, write_fd = os.pipe()
+        os.set_blocking(read_fd, False)
+        os.set_blocking(write_fd, False)
+        self._previous_wakeup_fd = signal.set_wakeup_fd(write_fd)
+        
+        wakeup = selectors.DefaultSelector()
+        wakeup.register(read_fd, selectors.EVENT_READ, data=write_fd)
+        return wakeup
+    
+    def _remove_signal_handlers(self, wakeup: Optional[selectors.BaseSelector]):
+        """Restore the signal state replaced by _install_signal_handlers."""
+        if wakeup is None:
+            return
+        signal.set_wakeup_fd(self._previous_wakeup_fd)
+        signal.signal(signal.SIGTERM, self._previous_sigterm)
+        for key in list(wakeup.get_map().values()):
+            os.close(key.fd)
+            os.close(key.data)
+        wakeup.close()
+    
+    def _handle_stop_signal(self, signum, frame):
+        """Ask the polling loop to stop after the current cycle."""
+        # Runs between bytecodes of the main thread, so it only flips the flag
+        self._running = False
+    
+    @staticmethod
+    def _sleep(seconds: float, wakeup: Optional[selectors.BaseSelector]):
+        """Sleep between cycles, returning early when a signal is delivered."""
+        if wakeup is None:
+            sleep(seconds)
+            return
+        for key, _ in wakeup.select(seconds):
+            # Drain the bytes the signal machinery wrote
+            try:
+                while os.read(key.fd, 512):
+                    pass
+            except BlockingIOError:
+                pass
+    
+    def run_once(self):
+        """Process the queue once, waiting for started jobs to finish."""
+        logger.info("Starting queue processing cycle...")
+        self._process_cycle()
+        self.shutdown()
+        logger.info("Queue processing cycle completed")
+    
+    def shutdown(self, wait: bool = True, stop_jobs: bool = False):
+        """
+        Stop accepting jobs and optionally wait for running ones to finish.
+        
+        With stop_jobs, running jobs are terminated (and recorded as failed)
+        rather than waited out; their scripts run in their own sessions, so
+        an interrupt of the runner never reaches them.
+        """
+        if stop_jobs:
+            self._stop_running_jobs()
+        self._executor.shutdown(wait=wait, cancel_futures=stop_jobs)
+        self._save_pool.shutdown(wait=wait)
+        # Only listings use the queue's I/O threads, and the loop has stopped listing
+        self.queue.close()
+    
+    def _stop_running_jobs(self):
+        """Terminate in-flight jobs' process groups until every job has returned."""
+        pending = {future for future in self._inflight.values() if not future.done()}
+        if not pending:
+            return
+        logger.info(f"Stopping {len(pending)} running job(s)")
+        while pending:
+            # A job may be between its move to running and starting its
+            # script, so sweep until all of them have come back
+            terminate_running_jobs()
+            _, pending = wait(pending, timeout=0.5)
     
     def _process_cycle(self):
         """Process one polling cycle."""
+        # Only jobs targeting this user are loaded; jobs meant for someone
+        # else are skipped by the queue before their files are parsed.
+        # Waiting and running jobs are only inspected, so read-only views do;
+        # full jobs are built only for the approved ones this cycle starts.
+        views = self.queue.job_views_by_status(
+            [JobStatus.inbox, JobStatus.running], target_email=self.email
+        )
+        
         # Check for timed out jobs
-        self._check_timeouts()
+        self._check_timeouts(views)
         
         # Log pending jobs
-        self._log_pending_jobs()
+        self._log_pending_jobs(views)
 
         # Execute approved jobs
         self._execute_approved_jobs()
+
+        # Make sure this cycle's status moves are on disk before the next scan
+        self._wait_for_saves()
     
-    def _check_timeouts(self):
+    def _move_job_async(self, job: Job, status: JobStatus, now: Optional[datetime] = None) -> Future:
+        """Move a job to a new status in the background."""
+        future = self._save_pool.submit(self.queue.move_job, job, status, now)
+        self._pending_saves.append(future)
+        return future
+    
+    def _wait_for_saves(self):
+        """Wait for background status moves and report any that failed."""
+        if not self._pending_saves:
+            return
+        done, _ = wait(self._pending_saves)
+        self._pending_saves.clear()
+        for future in done:
+            if future.exception() is not None:
+                logger.error(f"Failed to save job status: {future.exception()}")
+    
+    def _time_out(self, view: JobView, error_message: str, now: datetime):
+        """Load a timed-out job in full and move it to timedout in the background."""
+        job = self.queue.get_job_by_uid(view.uid)
+        if job is None:
+            return  # Moved or removed since it was listed
+        job.error_message = error_message
+        self._move_job_async(job, JobStatus.timedout, now)
+    
+    def _check_timeouts(self, views: Dict[JobStatus, List[JobView]]):
         """Check for jobs that have timed out waiting for approval or running too long."""
         current_time = datetime.now()
         
         # Check inbox jobs for approval timeout
-        inbox_jobs = self.queue.list_jobs(status=JobStatus.inbox)
-        for job in inbox_jobs:
+        inbox_jobs = views[JobStatus.inbox]
+        for job in list(inbox_jobs):
             if job.created_at and job.timeout_seconds:
                 elapsed = (current_time - job.created_at).total_seconds()
                 if elapsed > job.timeout_seconds:
                     logger.warning(f"Job {job.name} ({job.uid}) has timed out waiting for approval after {elapsed:.0f} seconds")
-                    job.error_message = f"Timed out waiting for approval after {job.timeout_seconds} seconds"
-                    self.queue.move_job(job, JobStatus.timedout)
+                    self._time_out(job, f"Timed out waiting for approval after {job.timeout_seconds} seconds", current_time)
+                    inbox_jobs.remove(job)
         
         # Check running jobs for execution timeout
-        running_jobs = self.queue.list_jobs(status=JobStatus.running)
-        for job in running_jobs:
+        running_jobs = views[JobStatus.running]
+        for job in list(running_jobs):
+            # Jobs executing here are bounded by the runner's own timeout
+            if job.uid in self._inflight:
+                continue
             if job.started_at and job.timeout_seconds:
                 elapsed = (current_time - job.started_at).total_seconds()
                 if elapsed > job.timeout_seconds:
                     logger.warning(f"Running job {job.name} ({job.uid}) has exceeded timeout of {job.timeout_seconds} seconds")
-                    job.error_message = f"Execution timed out after {job.timeout_seconds} seconds"
-                    self.queue.move_job(job, JobStatus.timedout)
+                    self._time_out(job, f"Execution timed out after {job.timeout_seconds} seconds", current_time)
+                    running_jobs.remove(job)
     
-    def _log_pending_jobs(self):
+    def _log_pending_jobs(self, views: Dict[JobStatus, List[JobView]]):
         """Log information about pending jobs."""
-        # Get pending jobs for this user
-        pending_jobs = self.queue.list_jobs(status=JobStatus.inbox, target_email=self.email)
+        pending_jobs = views[JobStatus.inbox]
+        
+        # Only log when the set of pending jobs has changed since last time
+        pending_uids = frozenset(job.uid for job in pending_jobs)
+        if pending_uids == self._last_pending:
+            return
+        self._last_pending = pending_uids
         
         if pending_jobs:
             logger.info(f"📋 {len(pending_jobs)} job(s) pending approval:")
@@ -135,26 +350,48 @@ class SimpleRunnerApp:
         # Don't log when no jobs - too verbose for continuous polling
     
     def _execute_approved_jobs(self):
-        """Execute all approved jobs."""
-        # Get approved jobs for this user
-        approved_jobs = self.queue.list_jobs(status=JobStatus.approved, target_email=self.email)
+        """Start approved jobs, up to the concurrency limit."""
+        # Forget jobs whose execution has finished, reporting any that
+        # failed so badly that even recording the failure raised
+        for uid, future in list(self._inflight.items()):
+            if future.done():
+                del self._inflight[uid]
+                if not future.cancelled() and future.exception() is not None:
+                    logger.error(f"Job {uid} could not be completed: {future.exception()}")
+        
+        available_slots = self.max_concurrent_jobs - len(self._inflight)
+        if available_slots <= 0:
+            return
         
-        if not approved_jobs:
+        # Approved jobs are loaded one at a time, and only until the free
+        # slots are filled; the rest wait for a later cycle unread
+        approved_jobs = (
+            job for job in self.queue.scan_jobs(JobStatus.approved, target_email=self.email)
+            if job.uid not in self._inflight
+        )
+        jobs_to_execute = list(islice(approved_jobs, available_slots))
+        if not jobs_to_execute:
             # Don't log when no jobs - too verbose for continuous polling
             return
         
-        logger.info(f"🚀 Executing {len(approved_jobs)} approved job(s)")
+        logger.info(f"🚀 Executing {len(jobs_to_execute)} approved job(s)")
         
-        for job in approved_jobs:
-            self._execute_single_job(job)
+        for job in jobs_to_execute:
+            # The job is tracked as in flight from here on, so the next cycle
+            # can't pick it up again while the move to running is written
+            started = self._move_job_async(job, JobStatus.running)
+            self._inflight[job.uid] = self._executor.submit(self._execute_single_job, job, started)
     
-    def _execute_single_job(self, job: Job):
-        """Execute a single job."""
+    def _execute_single_job(self, job: Job, started: Optional[Future] = None):
+        """Execute a single job, once its move to running has been saved."""
         logger.info(f"Starting execution of job: {job.name}")
         
         try:
-            # Update status to running and move to running directory
-            self.queue.move_job(job, JobStatus.running)
+            if started is None:
+                self.queue.move_job(job, JobStatus.running)
+            else:
+                # The job directory only exists under running once this is done
+                started.result()
             
             # Get the job directory
             job_dir = job.object_path
@@ -194,30 +431,27 @@ class SimpleRunnerApp:
     def _validate_script(self, script_path: Path) -> bool:
         """Validate that a script is safe to execute."""
         try:
-            # Basic validation - check that script exists and is readable
-            if not script_path.exists():
+            # Check for potentially dangerous commands, scanning large scripts
+            # in place rather than copying and decoding them first. Opening
+            # the script doubles as the existence check.
+            try:
+                f = open(script_path, "rb")
+            except FileNotFoundError:
                 logger.error(f"Script does not exist: {script_path}")
                 return False
+            with f:
+                if os.fstat(f.fileno()).st_size >= MMAP_SCAN_THRESHOLD:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        match = _DANGEROUS_RE.search(mm)
+                        # Copy the hit out while the mapping is still open
+                        found = match.group() if match else None
+                else:
+                    match = _DANGEROUS_RE.search(f.read())
+                    found = match.group() if match else None
 
-            # Read script content
-            script_content = script_path.read_text()
-
-            # Check for potentially dangerous commands
-            dangerous_commands = [
-                "rm -rf",
-                "sudo",
-                "> /dev/null",
-                "2>&1",
-                "wget",
-                "curl",
-                "nc",
-                "netcat",
-            ]
-        
-            for cmd in dangerous_commands:
-                if cmd in script_content:
-                    logger.warning(f"Script contains dangerous command: {cmd}")
-                    return False
+            if found:
+                logger.warning(f"Script contains dangerous command: {found.decode()}")
+                return False
 
             return True
         except Exception as e:
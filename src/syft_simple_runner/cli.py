@@ -36,7 +36,12 @@ def main():
     # Run command (default SyftBox mode)
     run_parser = subparsers.add_parser(
         "run", 
-        help="Run the job processor once (SyftBox integration mode)"
+        help="Run the job processor (SyftBox integration mode)"
+    )
+    run_parser.add_argument(
+        "--once",
+        action="store_true",
+        help="Process the queue a single time and exit instead of polling"
     )
     
     args = parser.parse_args()
@@ -51,18 +56,21 @@ def main():
     
     # Execute commands
     if args.command == "run":
-        run_app()
+        run_app(once=args.once)
     else:
         # Default to run mode for SyftBox compatibility
         run_app()
 
 
-def run_app():
+def run_app(once: bool = False):
     """Run the SyftBox app mode."""
     try:
         logger.info("Starting Syft Simple Runner...")
         app = SimpleRunnerApp()
-        app.run()
+        if once:
+            app.run_once()
+        else:
+            app.run()
         logger.info("Syft Simple Runner completed successfully")
     except Exception as e:
         logger.error(f"Runner failed: {e}")
@@ -1,15 +1,275 @@
 """Safe code execution runner for syft-simple-runner."""
 
 import os
+import selectors
+import signal
 import subprocess
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
 from loguru import logger
 from .syft_queue import Job
 
 
+# Output from each stream beyond this many bytes is not written to the log
+MAX_OUTPUT_SIZE = 10 * 1024 * 1024
+
+# Bytes at the end of each stream kept in memory for the returned logs
+OUTPUT_TAIL_SIZE = 64 * 1024
+
+READ_CHUNK_SIZE = 65536
+
+# Seconds a timed-out job gets to exit after SIGTERM before it is killed
+TERMINATE_GRACE_PERIOD = 2.0
+
+# (raw os.environ contents, decoded copy) as of the last job that started
+_env_cache: Optional[Tuple[dict, Dict[str, str]]] = None
+
+# Job processes started by run_job that haven't been reaped yet, so a
+# stopping runner can end them instead of waiting out their timeouts
+_running_processes: Set[subprocess.Popen] = set()
+_running_lock = threading.Lock()
+
+
+def _open_pidfd(process: subprocess.Popen) -> Optional[int]:
+    """Open a descriptor that becomes readable when the process exits (Linux 5.3+)."""
+    try:
+        return os.pidfd_open(process.pid)
+    except (AttributeError, OSError):
+        return None
+
+
+def _terminate_process_group(process: subprocess.Popen):
+    """Stop a job and everything it started: SIGTERM, then SIGKILL if it lingers."""
+    _terminate_process_groups([process])
+
+
+def _terminate_process_groups(processes: List[subprocess.Popen]):
+    """Stop several jobs at once, sharing one grace period between them."""
+    for process in processes:
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+    deadline = time.monotonic() + TERMINATE_GRACE_PERIOD
+    for process in processes:
+        try:
+            process.wait(timeout=max(deadline - time.monotonic(), 0))
+        except subprocess.TimeoutExpired:
+            pass
+    # Children may outlive the shell, so the group is killed either way
+    for process in processes:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        process.wait()
+
+
+def terminate_running_jobs() -> int:
+    """
+    Stop every job process run_job is still supervising.
+    
+    The jobs' run_job calls then return as failed, with the output so far.
+    
+    Returns:
+        Number of jobs signalled
+    """
+    with _running_lock:
+        processes = list(_running_processes)
+    _terminate_process_groups(processes)
+    return len(processes)
+
+
+class _StreamLog:
+    """
+    Job output written to execution.log, labelled by stream.
+    
+    stdout and stderr are interleaved as they arrive, so a "STDOUT:" or
+    "STDERR:" line goes in whenever the stream being written changes.
+    """
+    
+    def __init__(self, log):
+        self._log = log
+        self._stream = None
+        self._line_start = True
+    
+    def write(self, stream: str, chunk: bytes):
+        if stream != self._stream:
+            label = f"{stream}:\n".encode()
+            self._log.write(label if self._line_start else b"\n" + label)
+            self._stream = stream
+        self._log.write(chunk)
+        self._line_start = chunk.endswith(b"\n")
+
+
+def _stream_output(
+    process: subprocess.Popen, log, deadline: Optional[float], pidfd: Optional[int] = None
+) -> Tuple[bytes, bytes, bool]:
+    """
+    Copy a process's output into the log as it arrives, labelled by stream.
+    
+    Memory stays bounded no matter how much the job prints: only the tail
+    of each stream is kept, and output past MAX_OUTPUT_SIZE is read and
+    dropped so the job never blocks on a full pipe.
+    
+    With a pidfd the process's exit wakes the same select call as its
+    output. Whatever is still buffered in the pipes is then drained, without
+    waiting on background children that keep them open.
+    
+    Returns:
+        Tuple of (stdout tail, stderr tail, whether the deadline passed)
+    """
+    stdout_fd, stderr_fd = process.stdout.fileno(), process.stderr.fileno()
+    streams = {stdout_fd: "STDOUT", stderr_fd: "STDERR"}
+    stream_log = _StreamLog(log)
+    tails = {stdout_fd: bytearray(), stderr_fd: bytearray()}
+    written = {stdout_fd: 0, stderr_fd: 0}
+    open_fds = set(tails)
+    timed_out = False
+    exited = False
+    
+    with selectors.DefaultSelector() as selector:
+        for fd in open_fds:
+            selector.register(fd, selectors.EVENT_READ)
+        if pidfd is not None:
+            selector.register(pidfd, selectors.EVENT_READ)
+        
+        while open_fds:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                timed_out = not exited
+                break
+            if exited:
+                # Only take what is already buffered
+                remaining = 0
+            
+            events = selector.select(remaining)
+            if exited and not events:
+                break
+            
+            for key, _ in events:
+                if key.fd == pidfd:
+                    selector.unregister(pidfd)
+                    exited = True
+                    continue
+                
+                data = os.read(key.fd, READ_CHUNK_SIZE)
+                if not data:
+                    selector.unregister(key.fd)
+                    open_fds.discard(key.fd)
+                    continue
+                
+                if written[key.fd] < MAX_OUTPUT_SIZE:
+                    chunk = data[:MAX_OUTPUT_SIZE - written[key.fd]]
+                    stream_log.write(streams[key.fd], chunk)
+                    log.flush()
+                    written[key.fd] += len(chunk)
+                
+                tail = tails[key.fd]
+                tail += data
+                del tail[:-OUTPUT_TAIL_SIZE]
+    
+    return bytes(tails[stdout_fd]), bytes(tails[stderr_fd]), timed_out
+
+
+def _prepare_script(code_dir: Path) -> Optional[Path]:
+    """Return the job's run.sh, made executable, or None if it is missing."""
+    # Validate script exists; the same stat tells whether it needs chmod
+    run_script = code_dir / "run.sh"
+    try:
+        script_mode = run_script.stat().st_mode
+    except FileNotFoundError:
+        return None
+    
+    # Make script executable, skipping the metadata write when it already is
+    if not script_mode & 0o111:
+        run_script.chmod(script_mode | 0o755)
+    return run_script
+
+
+def _base_env() -> Dict[str, str]:
+    """
+    The runner's environment as a plain dict, decoded again only after it changes.
+    
+    Copying os.environ decodes every entry through the mapping in Python.
+    Comparing its raw (encoded) store against the one the cached copy was
+    built from is a single C-level dict comparison, so an unchanged
+    environment is reused and a changed one is picked up by the next job.
+    """
+    global _env_cache
+    raw = getattr(os.environ, "_data", None)
+    if raw is None:
+        return dict(os.environ)
+    cached = _env_cache
+    if cached is None or cached[0] != raw:
+        cached = _env_cache = (dict(raw), dict(os.environ))
+    return cached[1]
+
+
+def _job_env(job: Job, code_dir: Path, output_dir: Path) -> dict:
+    """Environment for a job's script."""
+    return {
+        **_base_env(),
+        "OUTPUT_DIR": str(output_dir),
+        "CODE_DIR": str(code_dir),
+        "JOB_ID": str(job.uid),
+        "JOB_NAME": job.name,
+    }
+
+
+def _log_header(job: Job, code_dir: Path, output_dir: Path) -> bytes:
+    return (
+        f"Job: {job.name} ({job.uid})\n"
+        f"Started: {datetime.now().isoformat()}\n"
+        f"Working Directory: {code_dir}\n"
+        f"Output Directory: {output_dir}\n"
+        f"{'-' * 80}\n\n"
+    ).encode()
+
+
+def _log_footer(timeout_note: str, returncode: int, completed: str) -> bytes:
+    return f"{timeout_note}\n\nExit Code: {returncode}\nCompleted: {completed}\n".encode()
+
+
+def _job_result(
+    job: Job, stdout: bytes, stderr: bytes, timeout_note: str, returncode: int, completed: str
+) -> Tuple[bool, str]:
+    """Format the kept output and report the job's outcome."""
+    stdout = stdout.decode(errors="replace")
+    stderr = stderr.decode(errors="replace") + timeout_note
+
+    # Format logs
+    log_content = (
+        f"STDOUT:\n{stdout}\n"
+        f"\nSTDERR:\n{stderr}\n"
+        f"\nExit Code: {returncode}\n"
+        f"Completed: {completed}"
+    )
+
+    # Check result
+    success = returncode == 0
+    if not success:
+        logger.warning(f"Job {job.uid} failed with exit code {returncode}")
+        logger.warning(f"Error output:\n{stderr}")
+
+    return success, log_content
+
+
+def _write_error_log(job: Job, log_file: Path, error_msg: str):
+    """Record a job that could not be run; best effort."""
+    try:
+        with open(log_file, "w") as f:
+            f.write(f"Job: {job.name} ({job.uid})\n")
+            f.write(f"Error: {error_msg}\n")
+            f.write(f"Time: {datetime.now().isoformat()}\n")
+    except Exception:
+        pass  # If we can't write to log file, just continue
+
+
 def run_job(job: Job, code_dir: Path, output_dir: Path, timeout: int = None) -> Tuple[bool, str]:
     """
     Run a code job in a safe environment.
@@ -22,92 +282,71 @@ def run_job(job: Job, code_dir: Path, output_dir: Path, timeout: int = None) ->
     Returns:
         Tuple of (success, logs)
     """
+    # code_dir is job_dir/code, so parent is job_dir
+    log_file = code_dir.parent / "execution.log"
     try:
-        # Validate script exists
-        run_script = code_dir / "run.sh"
-        if not run_script.exists():
+        run_script = _prepare_script(code_dir)
+        if run_script is None:
             return False, f"run.sh not found in {code_dir}"
         
-        # Make script executable
-        run_script.chmod(0o755)
-        
         # Set up environment
-        env = os.environ.copy()
-        env["OUTPUT_DIR"] = str(output_dir)
-        env["CODE_DIR"] = str(code_dir)
-        env["JOB_ID"] = str(job.uid)
-        env["JOB_NAME"] = job.name
-        
-        # Create log file
-        job_dir = code_dir.parent  # code_dir is job_dir/code, so parent is job_dir
-        log_file = job_dir / "execution.log"
+        env = _job_env(job, code_dir, output_dir)
 
-        # Write initial log header
-        with open(log_file, "w") as f:
-            f.write(f"Job: {job.name} ({job.uid})\n")
-            f.write(f"Started: {datetime.now().isoformat()}\n")
-            f.write(f"Working Directory: {code_dir}\n")
-            f.write(f"Output Directory: {output_dir}\n")
-            f.write("-" * 80 + "\n\n")
-
-        # Run the script and capture output in real-time
-        process = subprocess.Popen(
-            [str(run_script)],
-            cwd=code_dir,
-            env=env,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1,
-            universal_newlines=True,
-        )
-            
-        # Capture output with timeout
-        try:
-            # Use job timeout if available, otherwise no timeout
-            execution_timeout = timeout or getattr(job, 'timeout_seconds', None)
-            stdout, stderr = process.communicate(timeout=execution_timeout)
-        except subprocess.TimeoutExpired:
-            logger.error(f"Job {job.uid} timed out after {execution_timeout} seconds")
-            process.kill()
-            stdout, stderr = process.communicate()
-            stderr = (stderr or "") + f"\n\nERROR: Process timed out after {execution_timeout} seconds"
-
-        # Format logs
-        logs = []
-        logs.append("STDOUT:")
-        logs.append(stdout)
-        logs.append("\nSTDERR:")
-        logs.append(stderr)
-        logs.append(f"\nExit Code: {process.returncode}")
-        logs.append(f"Completed: {datetime.now().isoformat()}")
-        log_content = "\n".join(logs)
-
-        # Write logs to file
-        with open(log_file, "a") as f:
-            f.write(log_content)
-
-        # Check result
-        success = process.returncode == 0
-        if not success:
-            logger.warning(f"Job {job.uid} failed with exit code {process.returncode}")
-            logger.warning(f"Error output:\n{stderr}")
-
-        return success, log_content
+        # Use job timeout if available, otherwise no timeout
+        execution_timeout = timeout or getattr(job, 'timeout_seconds', None)
+        deadline = time.monotonic() + execution_timeout if execution_timeout else None
+
+        # The log is opened once: header, streamed output, then footer
+        with open(log_file, "wb") as log:
+            log.write(_log_header(job, code_dir, output_dir))
+            log.flush()
+
+            # Run the script, streaming its output into the log as it is produced
+            process = subprocess.Popen(
+                [str(run_script)],
+                cwd=code_dir,
+                env=env,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                # Output is read straight from the pipe fds as bytes and only the
+                # kept tails are decoded, so the pipe objects need no buffering
+                bufsize=0,
+                # Own process group, so a timeout can stop everything the script starts
+                start_new_session=True,
+            )
+            with _running_lock:
+                _running_processes.add(process)
+            pidfd = _open_pidfd(process)
+            try:
+                stdout, stderr, timed_out = _stream_output(process, log, deadline, pidfd)
+                if not timed_out:
+                    try:
+                        process.wait(timeout=None if deadline is None else max(deadline - time.monotonic(), 0))
+                    except subprocess.TimeoutExpired:
+                        timed_out = True
+                if timed_out:
+                    logger.error(f"Job {job.uid} timed out after {execution_timeout} seconds")
+                    _terminate_process_group(process)
+            finally:
+                with _running_lock:
+                    _running_processes.discard(process)
+                process.stdout.close()
+                process.stderr.close()
+                if pidfd is not None:
+                    os.close(pidfd)
+
+            completed = datetime.now().isoformat()
+            timeout_note = f"\n\nERROR: Process timed out after {execution_timeout} seconds" if timed_out else ""
+            log.write(_log_footer(timeout_note, process.returncode, completed))
+
+        return _job_result(job, stdout, stderr, timeout_note, process.returncode, completed)
             
     except Exception as e:
         error_msg = f"Error running job: {e}"
         logger.error(error_msg)
         
         # Try to write error to log file
-        try:
-            job_dir = code_dir.parent
-            log_file = job_dir / "execution.log"
-            with open(log_file, "w") as f:
-                f.write(f"Job: {job.name} ({job.uid})\n")
-                f.write(f"Error: {error_msg}\n")
-                f.write(f"Time: {datetime.now().isoformat()}\n")
-        except Exception:
-            pass  # If we can't write to log file, just continue
-
-        return False, error_msg 
\ No newline at end of file
+        _write_error_log(job, log_file, error_msg)
+
+        return False, error_msg
+
@@ -3,21 +3,120 @@ Simplified queue implementation using syft-objects.
 This is a copy of the syft-queue implementation for syft-simple-runner.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from operator import attrgetter
 from pathlib import Path
-from typing import Union, Optional, List
+from typing import Dict, Iterator, Union, Optional, List, Tuple
 from uuid import UUID, uuid4
 from datetime import datetime
 import enum
-import json
+import errno
 import tempfile
 import os
-import subprocess
-import random
-import string
-import time
+import shutil
+
+import orjson
 import syft_objects as syo
 
 
+# Plain JSON copy of the job metadata, kept next to the syft-object so the
+# queue can load jobs with a single file read
+JOB_METADATA_FILE = "job.json"
+
+# Append-only journal of status transitions made since the metadata was last
+# written in full, one "<revision>\t<timestamp>\t<status>" line each. job.json
+# plus this journal is the authoritative job state; see Job.
+STATUS_JOURNAL_FILE = "status.log"
+
+# Worker threads for loading job directories, and the directory size at
+# which loading switches from serial to the pool
+IO_POOL_WORKERS = 16
+PARALLEL_LOAD_THRESHOLD = 8
+
+# Entries kept in a queue's uid and target indexes before they are cleared.
+# Both are lookup hints that are rebuilt from disk as jobs are seen again.
+KNOWN_JOBS_LIMIT = 10000
+
+
+def _write_metadata_file(job_dir: Path, payload: bytes):
+    """
+    Write a job's JSON metadata copy.
+    
+    The file is written beside the target and renamed into place so a
+    concurrent scan never reads a half-written file.
+    """
+    metadata_file = job_dir / JOB_METADATA_FILE
+    tmp_file = metadata_file.with_suffix(".json.tmp")
+    tmp_file.write_bytes(payload)
+    os.replace(tmp_file, metadata_file)
+
+
+def _append_status_journal(job_dir: Path, revision: int, status: "JobStatus", timestamp: datetime):
+    """Record a status transition with a single small append."""
+    line = f"{revision}\t{timestamp.isoformat()}\t{status.value}\n".encode()
+    fd = os.open(job_dir / STATUS_JOURNAL_FILE, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line)
+    finally:
+        os.close(fd)
+
+
+def _apply_status_journal(job_dir: Path, metadata: dict) -> dict:
+    """
+    Replay journaled transitions newer than the stored metadata onto it.
+    
+    Entries are applied in the order they were appended, so a job journaled
+    through running and then completed gets both its started_at and
+    completed_at. Newer means a higher revision than the stored one, never
+    a later timestamp, so clock steps can't hide a transition.
+    """
+    try:
+        journal = (job_dir / STATUS_JOURNAL_FILE).read_bytes()
+    except FileNotFoundError:
+        return metadata
+    
+    # A full write after a transition already includes it (the journal is
+    # removed right after, but a crash can leave it behind)
+    stored = metadata.get("revision", 0)
+    
+    replayed = None
+    for line in journal.splitlines():
+        try:
+            revision, timestamp, status = line.decode().split("\t")
+            revision = int(revision)
+            status = JobStatus(status)
+            datetime.fromisoformat(timestamp)
+        except ValueError:
+            # A torn or foreign line; the rest of the journal still applies
+            continue
+        if revision <= stored:
+            continue
+        replayed = _replay_transition(replayed or metadata, revision, status, timestamp)
+    
+    return metadata if replayed is None else replayed
+
+
+def _replay_transition(metadata: dict, revision: int, status: "JobStatus", timestamp: str) -> dict:
+    """A copy of the metadata with one journaled transition applied."""
+    replayed = dict(metadata)
+    replayed["revision"] = revision
+    replayed["status"] = status.value
+    replayed["updated_at"] = timestamp
+    if status == JobStatus.running:
+        replayed["started_at"] = timestamp
+    elif status in _FINISHED_STATUSES:
+        replayed["completed_at"] = timestamp
+    return replayed
+
+
+def _parse_datetime(value):
+    """Restore a datetime serialized with isoformat()."""
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value
+
+
 class JobStatus(str, enum.Enum):
     """Status of a job in the queue."""
     
@@ -30,14 +129,80 @@ class JobStatus(str, enum.Enum):
     timedout = "timedout"    # Timed out waiting for approval
 
 
+# Statuses that set a job's completed_at
+_FINISHED_STATUSES = frozenset({JobStatus.completed, JobStatus.failed, JobStatus.rejected, JobStatus.timedout})
+
+
+def _serialize_value(v):
+    """Flatten a job attribute into a JSON-compatible value."""
+    if isinstance(v, UUID):
+        return str(v)
+    elif isinstance(v, datetime):
+        return v.isoformat()
+    elif isinstance(v, Path):
+        return str(v)
+    elif isinstance(v, JobStatus):
+        return v.value
+    else:
+        return v
+
+
+# Job attributes set at creation and not changed by status updates
+_STATIC_FIELDS = (
+    "uid",
+    "name",
+    "requester_email",
+    "target_email",
+    "code_folder",
+    "description",
+    "created_at",
+    "timeout_seconds",
+    "base_path",
+    "code_folder_relative",
+    "output_folder_relative",
+    "code_folder_absolute_fallback",
+    "output_folder_absolute_fallback",
+)
+_get_static_fields = attrgetter(*_STATIC_FIELDS)
+
+
 class Job:
     """
     A job object that uses syft-objects natively for storage.
     
-    All job metadata is stored in a syft-object that appears in syo.objects.
-    Supports relative paths for portability across pipeline stages.
+    Job metadata is written to a syft-object that appears in syo.objects,
+    mirrored as job.json. Supports relative paths for portability across
+    pipeline stages.
+    
+    Transitions that change only the status are appended to status.log
+    instead, and are folded into both on the next full write. Between full
+    writes the syft-object's status and timestamps lag behind, so job.json
+    plus status.log is the source of truth: read jobs through Queue, which
+    replays the journal, rather than from the syft-object directly.
     """
     
+    # Queues keep every loaded job in memory, so instances carry no __dict__
+    __slots__ = _STATIC_FIELDS + (
+        "object_path",
+        "tags",
+        "status",
+        "updated_at",
+        "started_at",
+        "completed_at",
+        "output_folder",
+        "error_message",
+        "exit_code",
+        "logs",
+        # Count of saves, full or journaled; orders the journal without a clock
+        "revision",
+        # Serialized metadata as last written by this instance, if any
+        "_saved_metadata",
+        # Stored metadata as a dict, if known
+        "_saved_dict",
+        # (static field values, their serialized form) from the last to_dict()
+        "_static_cache",
+    )
+    
     def __init__(self, folder_path: Union[str, Path], owner_email: str = None, **kwargs):
         """
         Initialize a Job.
@@ -49,25 +214,62 @@ class Job:
         """
         self.object_path = Path(folder_path).absolute()
         self.object_path.mkdir(parents=True, exist_ok=True)
+        self._saved_metadata = None
+        self._saved_dict = None
+        self._static_cache = None
+        self._set_fields(kwargs)
         
-        # Set job attributes
-        self.uid = kwargs.get('uid', uuid4())
+        # Create syft-object for this job
+        self._create_syft_object(owner_email)
+    
+    @classmethod
+    def from_dict(cls, folder_path: Union[str, Path], data: dict) -> "Job":
+        """
+        Rebuild a stored job from its metadata without writing it back.
+        
+        Args:
+            folder_path: Path to the existing job folder
+            data: Metadata as produced by to_dict()
+        """
+        job = cls.__new__(cls)
+        job.object_path = Path(folder_path).absolute()
+        job._saved_metadata = None
+        job._saved_dict = data
+        job._static_cache = None
+        job._set_fields(data)
+        return job
+    
+    def copy(self) -> "Job":
+        """A separate instance with the same state, sharing no mutable fields."""
+        clone = Job.__new__(Job)
+        for name in Job.__slots__:
+            setattr(clone, name, getattr(self, name))
+        clone.tags = list(self.tags)
+        return clone
+    
+    def _set_fields(self, kwargs: dict):
+        """Set job attributes, restoring types flattened by serialization."""
+        # Loaded jobs carry both timestamps; only new ones need the clock
+        now = None if 'created_at' in kwargs and 'updated_at' in kwargs else datetime.now()
+        uid = kwargs.get('uid', uuid4())
+        self.uid = UUID(uid) if isinstance(uid, str) else uid
         self.name = kwargs.get('name', '')
         self.requester_email = kwargs.get('requester_email', '')
         self.target_email = kwargs.get('target_email', '')
         self.code_folder = kwargs.get('code_folder', '')
         self.description = kwargs.get('description', '')
-        self.created_at = kwargs.get('created_at', datetime.now())
+        self.created_at = _parse_datetime(kwargs.get('created_at', now))
         self.timeout_seconds = kwargs.get('timeout_seconds', 86400)  # 24 hours
         self.tags = kwargs.get('tags', [])
-        self.status = kwargs.get('status', JobStatus.inbox)
-        self.updated_at = kwargs.get('updated_at', datetime.now())
-        self.started_at = kwargs.get('started_at', None)
-        self.completed_at = kwargs.get('completed_at', None)
+        self.status = JobStatus(kwargs.get('status', JobStatus.inbox))
+        self.updated_at = _parse_datetime(kwargs.get('updated_at', now))
+        self.started_at = _parse_datetime(kwargs.get('started_at', None))
+        self.completed_at = _parse_datetime(kwargs.get('completed_at', None))
         self.output_folder = kwargs.get('output_folder', None)
         self.error_message = kwargs.get('error_message', None)
         self.exit_code = kwargs.get('exit_code', None)
         self.logs = kwargs.get('logs', None)
+        self.revision = kwargs.get('revision', 0)
         
         # New fields for relative path support
         self.base_path = kwargs.get('base_path', str(self.object_path))
@@ -75,14 +277,32 @@ class Job:
         self.output_folder_relative = kwargs.get('output_folder_relative', None)
         self.code_folder_absolute_fallback = kwargs.get('code_folder_absolute_fallback', None)
         self.output_folder_absolute_fallback = kwargs.get('output_folder_absolute_fallback', None)
-        
-        # Create syft-object for this job
-        self._create_syft_object(owner_email)
     
     def _create_syft_object(self, owner_email: str = None):
         """Create the syft-object for this job."""
         metadata = self.to_dict()
         
+        # Nothing to write if the stored copy is already identical
+        payload = orjson.dumps(metadata)
+        stored = (self.object_path / JOB_METADATA_FILE).exists()
+        if payload == self._saved_metadata and stored:
+            return
+        
+        self.revision += 1
+        metadata["revision"] = self.revision
+        payload = orjson.dumps(metadata)
+        
+        # A change that replaying its status transition onto the stored
+        # metadata reproduces exactly is journaled instead of rewriting the
+        # whole object; anything else (say, an edited started_at) is not
+        if stored and self._saved_dict is not None and metadata == _replay_transition(
+            self._saved_dict, self.revision, self.status, metadata["updated_at"]
+        ):
+            _append_status_journal(self.object_path, self.revision, self.status, self.updated_at)
+            self._saved_metadata = payload
+            self._saved_dict = metadata
+            return
+        
         # Create the syft-object
         obj = syo.syobj(
             folder_path=self.object_path,
@@ -92,61 +312,145 @@ class Job:
         
         # Save the object
         obj.save()
+        
+        # Mirror the metadata as plain JSON for fast loading
+        _write_metadata_file(self.object_path, payload)
+        self._saved_metadata = payload
+        self._saved_dict = metadata
+        
+        # The full write supersedes any journaled transitions
+        try:
+            os.unlink(self.object_path / STATUS_JOURNAL_FILE)
+        except FileNotFoundError:
+            pass
     
-    def update_status(self, new_status: JobStatus, error_message: Optional[str] = None):
-        """Update job status and persist."""
+    def update_status(
+        self, new_status: JobStatus, error_message: Optional[str] = None, now: Optional[datetime] = None
+    ):
+        """Update job status and persist.
+        
+        A batch of transitions can pass one shared ``now`` for their timestamps.
+        """
+        if self._apply_status(new_status, error_message, now):
+            # Update the syft-object
+            self._create_syft_object()
+    
+    def _apply_status(
+        self, new_status: JobStatus, error_message: Optional[str] = None, now: Optional[datetime] = None
+    ) -> bool:
+        """
+        Update the in-memory status fields without persisting them.
+        
+        Returns:
+            bool: False if nothing changed and there is nothing to save
+        """
+        # Re-stating the current status changes nothing worth a save
+        if new_status == self.status and not error_message:
+            return False
+        
+        # One timestamp for the whole transition
+        if now is None:
+            now = datetime.now()
         self.status = new_status
-        self.updated_at = datetime.now()
+        self.updated_at = now
         
         if error_message:
             self.error_message = error_message
         
         if new_status == JobStatus.running:
-            self.started_at = datetime.now()
-        elif new_status in [JobStatus.completed, JobStatus.failed, JobStatus.rejected, JobStatus.timedout]:
-            self.completed_at = datetime.now()
-        
-        # Update the syft-object
-        self._create_syft_object()
+            self.started_at = now
+        elif new_status in _FINISHED_STATUSES:
+            self.completed_at = now
+        return True
     
     def to_dict(self) -> dict:
         """Convert job to dictionary for serialization."""
-        def serialize_value(v):
-            if isinstance(v, UUID):
-                return str(v)
-            elif isinstance(v, datetime):
-                return v.isoformat()
-            elif isinstance(v, Path):
-                return str(v)
-            elif isinstance(v, JobStatus):
-                return v.value
-            else:
-                return v
-        
         return {
-            "uid": serialize_value(self.uid),
-            "name": self.name,
-            "requester_email": self.requester_email,
-            "target_email": self.target_email,
-            "code_folder": serialize_value(self.code_folder),
-            "description": self.description,
-            "created_at": serialize_value(self.created_at),
-            "timeout_seconds": self.timeout_seconds,
+            **self._static_dict(),
             "tags": self.tags,
-            "status": serialize_value(self.status),
-            "updated_at": serialize_value(self.updated_at),
-            "started_at": serialize_value(self.started_at),
-            "completed_at": serialize_value(self.completed_at),
-            "output_folder": serialize_value(self.output_folder),
+            "status": _serialize_value(self.status),
+            "updated_at": _serialize_value(self.updated_at),
+            "started_at": _serialize_value(self.started_at),
+            "completed_at": _serialize_value(self.completed_at),
+            "output_folder": _serialize_value(self.output_folder),
             "error_message": self.error_message,
             "exit_code": self.exit_code,
             "logs": self.logs,
-            "base_path": self.base_path,
-            "code_folder_relative": self.code_folder_relative,
-            "output_folder_relative": self.output_folder_relative,
-            "code_folder_absolute_fallback": self.code_folder_absolute_fallback,
-            "output_folder_absolute_fallback": self.output_folder_absolute_fallback,
+            "revision": self.revision,
         }
+    
+    def _static_dict(self) -> dict:
+        """Serialized form of the fields that are fixed when a job is created.
+        
+        Status updates re-serialize the job several times, so this part is
+        kept and only rebuilt if one of the fields has been reassigned.
+        """
+        values = _get_static_fields(self)
+        cached = self._static_cache
+        if cached is not None and cached[0] == values:
+            return cached[1]
+        
+        static = {name: _serialize_value(value) for name, value in zip(_STATIC_FIELDS, values)}
+        self._static_cache = (values, static)
+        return static
+
+
+@dataclass(frozen=True)
+class JobView:
+    """
+    Read-only summary of a stored job, for listing and filtering.
+    
+    Built straight from the job's metadata; use a Job when the job is to
+    be updated or moved.
+    """
+    
+    __slots__ = (
+        "uid", "name", "status", "target_email", "requester_email",
+        "created_at", "started_at", "timeout_seconds", "code_folder", "object_path",
+    )
+    
+    uid: UUID
+    name: str
+    status: JobStatus
+    target_email: str
+    requester_email: str
+    created_at: Optional[datetime]
+    started_at: Optional[datetime]
+    timeout_seconds: Optional[int]
+    code_folder: str
+    object_path: Path
+    
+    @classmethod
+    def from_metadata(cls, job_dir: Path, metadata: dict) -> "JobView":
+        """Build a view from metadata as produced by Job.to_dict()."""
+        return cls(
+            uid=UUID(metadata["uid"]),
+            name=metadata.get("name", ""),
+            status=JobStatus(metadata.get("status", JobStatus.inbox)),
+            target_email=metadata.get("target_email", ""),
+            requester_email=metadata.get("requester_email", ""),
+            created_at=_parse_datetime(metadata.get("created_at")),
+            started_at=_parse_datetime(metadata.get("started_at")),
+            timeout_seconds=metadata.get("timeout_seconds"),
+            code_folder=metadata.get("code_folder", ""),
+            object_path=job_dir,
+        )
+    
+    @classmethod
+    def from_job(cls, job: Job) -> "JobView":
+        """Summarize a job that is already loaded."""
+        return cls(
+            uid=job.uid,
+            name=job.name,
+            status=job.status,
+            target_email=job.target_email,
+            requester_email=job.requester_email,
+            created_at=job.created_at,
+            started_at=job.started_at,
+            timeout_seconds=job.timeout_seconds,
+            code_folder=job.code_folder,
+            object_path=job.object_path,
+        )
 
 
 class Queue:
@@ -178,16 +482,65 @@ class Queue:
         self.name = name
         self.owner_email = owner_email
         
+        # Loaded jobs keyed by directory: (files signature, target_email, job).
+        # job is None when the entry was only read far enough to filter it out.
+        # Cached jobs are private snapshots: callers always get their own copy,
+        # so threads working on a job never share the instance.
+        self._job_cache: Dict[Path, Tuple[int, str, Optional[Job]]] = {}
+        
+        # Views built by job_views_by_status, keyed by directory:
+        # (files signature, view)
+        self._view_cache: Dict[Path, Tuple[int, JobView]] = {}
+        
+        # Target email by job uid. A job keeps its uid and target for life and
+        # its directory is named after the uid, so once seen, a foreign job can
+        # be skipped from its directory name alone, in any status.
+        self._targets: Dict[str, str] = {}
+        
+        # Status directory each known job was last seen in, so a lookup by
+        # uid opens one directory instead of probing every status
+        self._uid_index: Dict[UUID, JobStatus] = {}
+        
+        # Shared pool for loading many job directories concurrently; started
+        # on first use and again after close()
+        self._io_pool: Optional[ThreadPoolExecutor] = None
+        
         # Create queue directories
         self._initialize_directories()
         
         # Create queue metadata object
         self._create_syft_object()
     
+    def close(self):
+        """
+        Release the queue's I/O threads. Loads still running are left to finish.
+        
+        The queue stays usable; a later listing starts a fresh pool.
+        """
+        pool, self._io_pool = self._io_pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
+    
+    def _io_map(self, fn, items):
+        """Map fn over items on the shared I/O pool."""
+        pool = self._io_pool
+        if pool is None:
+            pool = self._io_pool = ThreadPoolExecutor(max_workers=IO_POOL_WORKERS)
+        return pool.map(fn, items)
+    
+    def __enter__(self) -> "Queue":
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
     def _initialize_directories(self):
         """Create the queue directory structure."""
-        for status in JobStatus:
-            status_dir = self.object_path / status.value
+        # Directory holding the jobs currently in each status
+        self._status_dirs: Dict[JobStatus, Path] = {
+            status: self.object_path / status.value for status in JobStatus
+        }
+        for status_dir in self._status_dirs.values():
             status_dir.mkdir(parents=True, exist_ok=True)
     
     def _create_syft_object(self):
@@ -219,7 +572,7 @@ class Queue:
             Job: The created job
         """
         job_uid = uuid4()
-        job_dir = self.object_path / JobStatus.inbox.value / str(job_uid)
+        job_dir = self._status_dirs[JobStatus.inbox] / str(job_uid)
         
         job = Job(
             job_dir,
@@ -231,6 +584,7 @@ class Queue:
             status=JobStatus.inbox,
             **kwargs
         )
+        self._remember(job)
         
         return job
     
@@ -245,67 +599,325 @@ class Queue:
         Returns:
             List[Job]: List of jobs matching criteria
         """
-        jobs = []
         statuses = [status] if status else list(JobStatus)
+        grouped = self.jobs_by_status(statuses, target_email=target_email)
+        return [job for job_status in statuses for job in grouped[job_status]]
+    
+    def jobs_by_status(
+        self, statuses: List[JobStatus], target_email: Optional[str] = None
+    ) -> Dict[JobStatus, List[Job]]:
+        """
+        Load the jobs in several statuses in one pass, grouped by status.
         
-        for job_status in statuses:
-            status_dir = self.object_path / job_status.value
-            if not status_dir.exists():
-                continue
-                
-            for job_dir in status_dir.iterdir():
-                if not job_dir.is_dir():
-                    continue
-                    
+        Args:
+            statuses: Statuses to load
+            target_email: Filter by target email
+            
+        Returns:
+            Dict[JobStatus, List[Job]]: Jobs for each requested status
+        """
+        return self._load_by_status(statuses, target_email, self._try_load_job, self._job_cache)
+    
+    def job_views_by_status(
+        self, statuses: List[JobStatus], target_email: Optional[str] = None
+    ) -> Dict[JobStatus, List[JobView]]:
+        """
+        Like jobs_by_status, but as read-only views for callers that only
+        inspect the jobs; no Job instances are built.
+        """
+        return self._load_by_status(statuses, target_email, self._try_load_view, self._view_cache)
+    
+    def _load_by_status(self, statuses: List[JobStatus], target_email: Optional[str], load, cache: dict) -> dict:
+        """Load every candidate in the given statuses with load(), grouped by status."""
+        # Each status has its own directory, so only the requested ones are
+        # walked. Listings are latency-bound on synced storage, so several
+        # directories are listed at once.
+        status_dirs = [self._status_dirs[job_status] for job_status in statuses]
+        if len(status_dirs) > 1:
+            listings = list(self._io_map(self._list_job_dirs, status_dirs))
+        else:
+            listings = [self._list_job_dirs(status_dir) for status_dir in status_dirs]
+        
+        self._bound_indexes()
+        
+        # Candidates from every status are loaded as one batch, so the pool
+        # stays busy even when the jobs are spread thinly across directories
+        batch = [
+            (job_status, job_dir)
+            for job_status, all_dirs in zip(statuses, listings)
+            for job_dir in self._candidate_dirs(all_dirs, target_email)
+        ]
+        
+        # Loading is dominated by file I/O, so larger batches are read in
+        # parallel; small ones aren't worth the dispatch overhead
+        if len(batch) >= PARALLEL_LOAD_THRESHOLD:
+            loaded = self._io_map(lambda entry: load(entry[1], target_email), batch)
+        else:
+            loaded = (load(job_dir, target_email) for _, job_dir in batch)
+        
+        grouped = {job_status: [] for job_status in statuses}
+        for (job_status, _), job in zip(batch, loaded):
+            if job is not None:
+                grouped[job_status].append(job)
+        
+        self._prune_cache(cache, status_dirs, listings)
+        return grouped
+    
+    @staticmethod
+    def _prune_cache(cache: dict, status_dirs: List[Path], listings: List[List[Path]]):
+        """Forget jobs that have left the walked status directories."""
+        # Snapshot the keys: executor threads update the cache while jobs run
+        walked = set(status_dirs)
+        seen = {job_dir for all_dirs in listings for job_dir in all_dirs}
+        for cached_dir in [d for d in list(cache) if d.parent in walked and d not in seen]:
+            cache.pop(cached_dir, None)
+    
+    def _try_load_view(self, job_dir: Path, target_email: Optional[str] = None) -> Optional[JobView]:
+        """Read a job's view, skipping directories that can't be read."""
+        try:
+            # A view or job already loaded and unchanged on disk needs no read at all
+            signature = self._dir_signature(job_dir)
+            cached_view = self._view_cache.get(job_dir)
+            cached_job = self._job_cache.get(job_dir)
+            if cached_view and cached_view[0] == signature:
+                view = cached_view[1]
+            elif cached_job and cached_job[2] is not None and cached_job[0] == signature:
+                view = JobView.from_job(cached_job[2])
+            else:
+                metadata = self._read_metadata(job_dir)
+                if not metadata:
+                    return None
+                view = JobView.from_metadata(job_dir, metadata)
+                self._targets[job_dir.name] = view.target_email
+            
+            self._view_cache[job_dir] = (signature, view)
+            if target_email and view.target_email != target_email:
+                return None
+            return view
+        except FileNotFoundError:
+            # Moved to another status since the directory was listed
+            return None
+        except Exception as e:
+            print(f"Error loading job from {job_dir}: {e}")
+            return None
+    
+    def scan_jobs(self, status: JobStatus, target_email: Optional[str] = None) -> Iterator[Job]:
+        """
+        Lazily yield the jobs in one status.
+        
+        The directory is listed once and each job is only loaded when the
+        caller asks for it, so stopping early skips the remaining reads.
+        
+        Args:
+            status: Status to scan
+            target_email: Filter by target email
+        """
+        status_dir = self._status_dirs[status]
+        job_dirs = self._list_job_dirs(status_dir)
+        self._prune_cache(self._job_cache, [status_dir], [job_dirs])
+        for job_dir in self._candidate_dirs(job_dirs, target_email):
+            job = self._try_load_job(job_dir, target_email)
+            if job is not None:
+                yield job
+    
+    @staticmethod
+    def _list_job_dirs(status_dir: Path) -> List[Path]:
+        """Job directories in a status directory, empty if it doesn't exist yet."""
+        # scandir reports the entry type from the directory listing itself,
+        # so telling job folders from stray files needs no extra stat
+        try:
+            with os.scandir(status_dir) as entries:
+                return [status_dir / entry.name for entry in entries if entry.is_dir(follow_symlinks=False)]
+        except FileNotFoundError:
+            return []
+    
+    def _candidate_dirs(self, job_dirs: List[Path], target_email: Optional[str]) -> List[Path]:
+        """Drop jobs already known to belong to someone else, without touching their files."""
+        if not target_email:
+            return job_dirs
+        return [
+            job_dir for job_dir in job_dirs
+            if self._targets.get(job_dir.name, target_email) == target_email
+        ]
+    
+    def status_signature(self, statuses: List[JobStatus]) -> Tuple[int, ...]:
+        """
+        Cheap change marker for the given statuses.
+        
+        A status directory's mtime changes whenever a job is created in it or
+        moved into or out of it, so comparing signatures tells whether a queue
+        scan could find anything new.
+        """
+        signature = []
+        for status in statuses:
+            try:
+                signature.append(self._status_dirs[status].stat().st_mtime_ns)
+            except FileNotFoundError:
+                signature.append(0)
+        return tuple(signature)
+    
+    @staticmethod
+    def _dir_signature(job_dir: Path) -> int:
+        """Latest mtime among a job directory and the files directly inside it."""
+        latest = job_dir.stat().st_mtime_ns
+        with os.scandir(job_dir) as entries:
+            for entry in entries:
+                if entry.is_file(follow_symlinks=False):
+                    latest = max(latest, entry.stat().st_mtime_ns)
+        return latest
+    
+    def _try_load_job(self, job_dir: Path, target_email: Optional[str] = None) -> Optional[Job]:
+        """Load a job, reporting and skipping directories that can't be read."""
+        try:
+            return self._load_job(job_dir, target_email)
+        except FileNotFoundError:
+            # Moved to another status since the directory was listed
+            return None
+        except Exception as e:
+            print(f"Error loading job from {job_dir}: {e}")
+            return None
+    
+    def _load_job(self, job_dir: Path, target_email: Optional[str] = None) -> Optional[Job]:
+        """Load a job, reusing the cached instance while its files are unchanged."""
+        cached = self._job_cache.get(job_dir)
+        if cached and cached[0] == self._dir_signature(job_dir):
+            _, cached_target, job = cached
+            if target_email and cached_target != target_email:
+                return None
+            if job is not None:
+                return job.copy()
+        
+        metadata = self._read_metadata(job_dir)
+        if not metadata:
+            return None
+        
+        # Filter by target_email if specified, before building the Job
+        job_target = metadata.get('target_email', '')
+        self._targets[job_dir.name] = job_target
+        if target_email and job_target != target_email:
+            self._job_cache[job_dir] = (self._dir_signature(job_dir), job_target, None)
+            return None
+        
+        # Rebuild the job from its stored metadata; loading never writes
+        job = Job.from_dict(job_dir, metadata)
+        self._remember(job)
+        return job
+    
+    @staticmethod
+    def _read_metadata(job_dir: Path) -> Optional[dict]:
+        """Read job metadata from its JSON copy, falling back to the syft-object."""
+        try:
+            metadata = orjson.loads((job_dir / JOB_METADATA_FILE).read_bytes())
+            return _apply_status_journal(job_dir, metadata)
+        except FileNotFoundError:
+            obj = syo.syobj(job_dir)
+            metadata = obj.metadata if obj else None
+            if metadata:
+                # Jobs written before job.json existed get one now, so later
+                # loads take the single-read path
                 try:
-                    # Load job from syft-object
-                    obj = syo.syobj(job_dir)
-                    if obj and obj.metadata:
-                        # Filter by target_email if specified
-                        if target_email and obj.metadata.get('target_email') != target_email:
-                            continue
-                            
-                        # Create Job instance from metadata
-                        job = Job(job_dir, owner_email=self.owner_email, **obj.metadata)
-                        jobs.append(job)
-                except Exception as e:
-                    print(f"Error loading job from {job_dir}: {e}")
-                    continue
-        
-        return jobs
+                    _write_metadata_file(job_dir, orjson.dumps(metadata))
+                except (OSError, TypeError):
+                    pass
+                # The syft-object lags behind journaled transitions too
+                metadata = _apply_status_journal(job_dir, metadata)
+            return metadata
+    
+    def _remember(self, job: Job):
+        """Cache a snapshot of a job at its current location and file signature."""
+        self._job_cache[job.object_path] = (
+            self._dir_signature(job.object_path), job.target_email, job.copy()
+        )
+        self._bound_indexes()
+        self._targets[str(job.uid)] = job.target_email
+        self._uid_index[job.uid] = JobStatus(job.object_path.parent.name)
+    
+    def _forget(self, job: Job, job_dir: Path):
+        """Drop everything cached about a job, e.g. once it has finished."""
+        self._job_cache.pop(job_dir, None)
+        self._view_cache.pop(job_dir, None)
+        self._targets.pop(str(job.uid), None)
+        self._uid_index.pop(job.uid, None)
+    
+    def _bound_indexes(self):
+        """Keep the uid and target indexes from growing without bound."""
+        if len(self._targets) > KNOWN_JOBS_LIMIT:
+            self._targets.clear()
+        if len(self._uid_index) > KNOWN_JOBS_LIMIT:
+            self._uid_index.clear()
     
     def get_job_by_uid(self, job_uid: Union[str, UUID]) -> Optional[Job]:
         """Get a job by its UID."""
         if isinstance(job_uid, str):
             job_uid = UUID(job_uid)
-            
+        
+        # Try the last known location first; it can be stale if another
+        # process moved the job, in which case every status is searched
+        known_status = self._uid_index.get(job_uid)
+        if known_status is not None:
+            job = self._read_job(self._status_dirs[known_status] / str(job_uid))
+            if job is not None:
+                return job
+            del self._uid_index[job_uid]
+        
         for status in JobStatus:
-            job_dir = self.object_path / status.value / str(job_uid)
-            if job_dir.exists():
-                try:
-                    obj = syo.syobj(job_dir)
-                    if obj and obj.metadata:
-                        return Job(job_dir, owner_email=self.owner_email, **obj.metadata)
-                except Exception:
-                    continue
+            if status is known_status:
+                continue
+            job = self._read_job(self._status_dirs[status] / str(job_uid))
+            if job is not None:
+                self._uid_index[job_uid] = status
+                return job
         return None
     
-    def move_job(self, job: Job, new_status: JobStatus):
-        """Move a job to a new status directory."""
+    def _read_job(self, job_dir: Path) -> Optional[Job]:
+        """Build a job straight from its directory, None if it isn't there."""
+        if not job_dir.exists():
+            return None
+        try:
+            metadata = self._read_metadata(job_dir)
+        except Exception:
+            return None
+        return Job.from_dict(job_dir, metadata) if metadata else None
+    
+    def move_job(self, job: Job, new_status: JobStatus, now: Optional[datetime] = None):
+        """Move a job to a new status directory.
+        
+        Callers moving many jobs at once can pass one shared ``now``.
+        """
         old_dir = job.object_path
-        new_dir = self.object_path / new_status.value / str(job.uid)
+        new_dir = self._status_dirs[new_status] / str(job.uid)
+        moved = old_dir != new_dir
         
-        if old_dir != new_dir:
+        if moved:
             # Create new directory
             new_dir.parent.mkdir(parents=True, exist_ok=True)
             
-            # Move the job directory
-            if old_dir.exists():
-                old_dir.rename(new_dir)
-                
-            # Update job path
+            # Move the job directory; a rename within the queue is atomic.
+            # Status directories on another filesystem need a copying move.
+            try:
+                os.replace(old_dir, new_dir)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                shutil.move(str(old_dir), str(new_dir))
             job.object_path = new_dir
-            job.update_status(new_status)
+        
+        # Update the status, then write the job once at its new home; a job
+        # already in new_status and in place needs no write at all
+        if not job._apply_status(new_status, now=now) and not moved:
+            return
+        job._create_syft_object()
+        
+        # Finished jobs are never scanned again, so nothing would evict
+        # them (and their logs) from the caches
+        if new_status in _FINISHED_STATUSES:
+            self._forget(job, old_dir)
+        else:
+            self._job_cache.pop(old_dir, None)
+            self._view_cache.pop(old_dir, None)
+            self._remember(job)
 
 
 def q(name: str = "default-queue", owner_email: str = None, force: bool = False, **kwargs) -> Queue:
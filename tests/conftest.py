@@ -0,0 +1,27 @@
+"""Shared fixtures for the syft-simple-runner tests."""
+
+from pathlib import Path
+
+import pytest
+
+
+class FakeClient:
+    """Stand-in for a SyftBox client, keeping app data under a temp dir."""
+
+    def __init__(self, email: str, root: Path):
+        self.email = email
+        self._root = root
+
+    def app_data(self, app_name: str) -> Path:
+        return self._root / app_name
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """A client with its own email, so per-user caches never leak between tests."""
+    from backend import utils
+
+    # Read history from local storage even where syft-code-queue is installed
+    monkeypatch.setattr(utils, "q", None)
+    monkeypatch.setattr(utils, "create_client", None)
+    return FakeClient(f"{tmp_path.name}@example.com", tmp_path)
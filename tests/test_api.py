@@ -0,0 +1,66 @@
+"""HTTP caching on the backend API."""
+
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import main, utils
+
+
+@pytest.fixture
+def api(client):
+    main.app.dependency_overrides[main.get_client] = lambda: client
+    yield TestClient(main.app)
+    main.app.dependency_overrides.clear()
+
+
+def test_history_etag_answers_304(api, client):
+    utils.store_job_history(client, {
+        "uid": "job-1",
+        "name": "job",
+        "status": "completed",
+        "requester_email": "requester@example.com",
+        "target_email": "owner@example.com",
+        "created_at": datetime.now().isoformat(),
+        "success": True,
+    })
+
+    first = api.get("/api/v1/jobs/history")
+    assert first.status_code == 200
+    assert [job["uid"] for job in first.json()["jobs"]] == ["job-1"]
+    etag = first.headers["etag"]
+
+    cached = api.get("/api/v1/jobs/history", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+    stale = api.get("/api/v1/jobs/history", headers={"If-None-Match": '"other"'})
+    assert stale.status_code == 200
+
+
+def test_root_etag_answers_304(api):
+    first = api.get("/")
+    if first.status_code != 200 or "etag" not in first.headers:
+        pytest.skip("frontend build not present")
+
+    cached = api.get("/", headers={"If-None-Match": first.headers["etag"]})
+    assert cached.status_code == 304
+
+
+def test_job_details_follow_status_changes(api, client):
+    record = {
+        "uid": "job-2",
+        "name": "job",
+        "status": "pending",
+        "requester_email": "requester@example.com",
+        "target_email": "owner@example.com",
+        "created_at": datetime.now().isoformat(),
+        "success": False,
+    }
+    utils.store_job_history(client, record)
+    assert api.get("/api/v1/jobs/history/job-2").json()["job"]["status"] == "pending"
+
+    utils.store_job_history(client, {**record, "status": "rejected"})
+    assert api.get("/api/v1/jobs/history/job-2").json()["job"]["status"] == "rejected"
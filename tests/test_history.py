@@ -0,0 +1,99 @@
+"""Local job history storage and its indexes."""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import orjson
+
+from backend import utils
+
+
+def _record(uid: str, created_at: datetime) -> dict:
+    return {
+        "uid": uid,
+        "name": f"job {uid}",
+        "status": "completed",
+        "requester_email": "requester@example.com",
+        "target_email": "owner@example.com",
+        "created_at": created_at.isoformat(),
+        "started_at": created_at.isoformat(),
+        "completed_at": (created_at + timedelta(seconds=5)).isoformat(),
+        "success": True,
+    }
+
+
+def _write_legacy_records(client, *records):
+    """Write per-job files the way installs from before the indexes did."""
+    history_dir = client.app_data("syft-simple-runner") / "job_history"
+    history_dir.mkdir(parents=True)
+    for record in records:
+        (history_dir / f"{record['uid']}.json").write_bytes(orjson.dumps(record))
+    return history_dir
+
+
+def test_store_appends_to_index(client):
+    now = datetime.now()
+    assert utils.store_job_history(client, _record("a", now))
+    assert utils.store_job_history(client, _record("b", now + timedelta(seconds=1)))
+
+    history = utils.get_job_history(client)
+
+    assert [item.uid for item in history] == ["b", "a"]
+    assert history[0].execution_time == 5
+
+
+def test_first_store_after_upgrade_indexes_existing_records(client):
+    now = datetime.now()
+    history_dir = _write_legacy_records(
+        client, _record("old-1", now - timedelta(days=2)), _record("old-2", now - timedelta(days=1))
+    )
+
+    assert utils.store_job_history(client, _record("new", now))
+
+    index_file = history_dir / utils.HISTORY_INDEX_FILE
+    indexed = {orjson.loads(line)["uid"] for line in index_file.read_bytes().splitlines()}
+    assert indexed == {"old-1", "old-2", "new"}
+    assert {item.uid for item in utils.get_job_history(client)} == {"old-1", "old-2", "new"}
+
+
+def test_first_store_after_upgrade_seeds_cleanup_index(client):
+    now = datetime.now()
+    # Freshly written, so only created_at shows that the first record is old
+    history_dir = _write_legacy_records(
+        client, _record("expired", now - timedelta(days=60)), _record("recent", now - timedelta(days=1))
+    )
+
+    assert utils.store_job_history(client, _record("new", now))
+
+    expiry_file = history_dir / utils.HISTORY_EXPIRY_FILE
+    indexed = {line.split()[1] for line in expiry_file.read_bytes().splitlines()}
+    assert indexed == {b"expired", b"recent", b"new"}
+
+    assert utils.clear_old_job_history(client, keep_days=30) == 1
+    assert not (history_dir / "expired.json").exists()
+    assert {item.uid for item in utils.get_job_history(client)} == {"recent", "new"}
+
+
+def test_cleanup_without_index_checks_created_at(client):
+    now = datetime.now()
+    history_dir = _write_legacy_records(
+        client, _record("expired", now - timedelta(days=60)), _record("recent", now)
+    )
+
+    assert utils.clear_old_job_history(client, keep_days=30) == 1
+    assert sorted(p.name for p in history_dir.glob("*.json")) == ["recent.json"]
+    assert (history_dir / utils.HISTORY_EXPIRY_FILE).exists()
+
+
+def test_concurrent_readers_rebuild_index_once(client):
+    now = datetime.now()
+    history_dir = _write_legacy_records(
+        client, *(_record(f"job-{i}", now - timedelta(minutes=i)) for i in range(20))
+    )
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: utils._read_history_index(history_dir), range(16)))
+
+    assert all(len(records) == 20 for records in results)
+    assert len((history_dir / utils.HISTORY_INDEX_FILE).read_bytes().splitlines()) == 20
+    assert not (history_dir / "index.jsonl.tmp").exists()
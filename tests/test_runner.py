@@ -0,0 +1,106 @@
+"""Running job scripts."""
+
+import threading
+import time
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from syft_simple_runner import runner
+from syft_simple_runner.runner import run_job, terminate_running_jobs
+
+
+def _alive(pid: int) -> bool:
+    """Whether the process exists and has not exited (zombies count as exited)."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except FileNotFoundError:
+        return False
+
+
+def _job_dirs(tmp_path, script: str):
+    code_dir = tmp_path / "code"
+    output_dir = tmp_path / "output"
+    code_dir.mkdir()
+    output_dir.mkdir()
+    (code_dir / "run.sh").write_text(script)
+    return code_dir, output_dir
+
+
+@pytest.fixture
+def job():
+    return SimpleNamespace(uid=uuid4(), name="job", timeout_seconds=1)
+
+
+# Starts a child that ignores SIGTERM and outlives the shell unless its
+# whole process group is killed
+BACKGROUND_CHILD = "#!/bin/bash\ntrap '' TERM\nsleep 300 &\necho $! > \"$OUTPUT_DIR/pid\"\nwait\n"
+
+
+def test_timeout_kills_child_processes(tmp_path, job):
+    code_dir, output_dir = _job_dirs(tmp_path, BACKGROUND_CHILD)
+
+    started = time.monotonic()
+    success, logs = run_job(job, code_dir, output_dir)
+
+    assert not success
+    assert "timed out after 1 seconds" in logs
+    assert time.monotonic() - started < 10
+
+    pid = int((output_dir / "pid").read_text())
+    deadline = time.monotonic() + 2
+    while _alive(pid) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not _alive(pid)
+
+
+def test_log_labels_each_stream(tmp_path, job):
+    code_dir, output_dir = _job_dirs(
+        tmp_path, "#!/bin/bash\necho out\necho err >&2\necho more >&2\n"
+    )
+
+    success, logs = run_job(job, code_dir, output_dir)
+
+    assert success
+    assert "STDOUT:\nout\n" in logs
+    assert "STDERR:\nerr\nmore\n" in logs
+    log = (tmp_path / "execution.log").read_text()
+    assert "STDOUT:\nout\nSTDERR:\nerr\nmore\n" in log
+
+
+def test_environment_follows_os_environ(tmp_path, job, monkeypatch):
+    code_dir, output_dir = _job_dirs(tmp_path, "#!/bin/bash\necho \"$LATE_SETTING\"\n")
+    monkeypatch.setenv("LATE_SETTING", "picked-up")
+
+    success, logs = run_job(job, code_dir, output_dir)
+
+    assert success
+    assert "picked-up" in logs
+
+
+def test_terminate_running_jobs_stops_them(tmp_path, job):
+    code_dir, output_dir = _job_dirs(tmp_path, "#!/bin/bash\necho started\nsleep 300\n")
+    job.timeout_seconds = 300
+    result = []
+    thread = threading.Thread(target=lambda: result.append(run_job(job, code_dir, output_dir)))
+    thread.start()
+
+    deadline = time.monotonic() + 5
+    while not terminate_running_jobs() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    thread.join(timeout=10)
+
+    assert not thread.is_alive()
+    success, _ = result[0]
+    assert not success
+
+
+def test_base_env_is_reused_until_the_environment_changes(monkeypatch):
+    monkeypatch.setenv("CACHED_SETTING", "one")
+    first = runner._base_env()
+    assert runner._base_env() is first
+
+    monkeypatch.setenv("CACHED_SETTING", "two")
+    assert runner._base_env()["CACHED_SETTING"] == "two"
@@ -0,0 +1,93 @@
+"""Job storage in the file-backed queue."""
+
+from datetime import timedelta
+
+from syft_simple_runner.syft_queue import STATUS_JOURNAL_FILE, JobStatus, Queue
+
+
+def test_journaled_transitions_replay_on_load(tmp_path):
+    queue = Queue(tmp_path, owner_email="owner@example.com")
+    job = queue.create_job("job", "requester@example.com", "owner@example.com")
+    queue.move_job(job, JobStatus.approved)
+    queue.move_job(job, JobStatus.running)
+    started_at = job.started_at
+    queue.move_job(job, JobStatus.completed)
+
+    # The transitions were journaled rather than written in full
+    journal = (job.object_path / STATUS_JOURNAL_FILE).read_text().splitlines()
+    assert [line.split("\t")[2] for line in journal] == ["approved", "running", "completed"]
+
+    loaded = Queue(tmp_path, owner_email="owner@example.com").get_job_by_uid(job.uid)
+
+    assert loaded.status == JobStatus.completed
+    assert loaded.started_at == started_at
+    assert loaded.completed_at == job.completed_at
+    assert loaded.updated_at == job.updated_at
+
+
+def test_edited_timestamps_are_written_in_full(tmp_path):
+    queue = Queue(tmp_path, owner_email="owner@example.com")
+    job = queue.create_job("job", "requester@example.com", "owner@example.com")
+    queue.move_job(job, JobStatus.running)
+    started_at = job.started_at.replace(year=2020)
+    job.started_at = started_at
+    job._create_syft_object()
+
+    assert not (job.object_path / STATUS_JOURNAL_FILE).exists()
+    loaded = Queue(tmp_path, owner_email="owner@example.com").get_job_by_uid(job.uid)
+    assert loaded.started_at == started_at
+
+
+def test_finished_jobs_leave_the_caches(tmp_path):
+    queue = Queue(tmp_path, owner_email="owner@example.com")
+    job = queue.create_job("job", "requester@example.com", "owner@example.com")
+    queue.move_job(job, JobStatus.running)
+    job.logs = "x" * 100_000
+    queue.move_job(job, JobStatus.completed)
+
+    assert not queue._job_cache
+    assert job.uid not in queue._uid_index
+    assert str(job.uid) not in queue._targets
+    assert queue.get_job_by_uid(job.uid).status == JobStatus.completed
+
+
+def test_scan_jobs_filters_by_target(tmp_path):
+    queue = Queue(tmp_path, owner_email="owner@example.com")
+    mine = queue.create_job("mine", "requester@example.com", "owner@example.com")
+    queue.create_job("theirs", "requester@example.com", "other@example.com")
+
+    scanned = list(
+        Queue(tmp_path, owner_email="owner@example.com").scan_jobs(
+            JobStatus.inbox, target_email="owner@example.com"
+        )
+    )
+
+    assert [job.uid for job in scanned] == [mine.uid]
+
+
+def test_moving_to_the_current_status_writes_nothing(tmp_path):
+    queue = Queue(tmp_path, owner_email="owner@example.com")
+    job = queue.create_job("job", "requester@example.com", "owner@example.com")
+    queue.move_job(job, JobStatus.approved)
+    updated_at = job.updated_at
+    job_file = job.object_path / "job.json"
+    written = job_file.stat().st_mtime_ns
+
+    queue.move_job(job, JobStatus.approved)
+
+    assert job.updated_at == updated_at
+    assert job_file.stat().st_mtime_ns == written
+    assert (job.object_path / STATUS_JOURNAL_FILE).read_text().count("\n") == 1
+
+
+def test_journal_replay_ignores_clock_steps(tmp_path):
+    queue = Queue(tmp_path, owner_email="owner@example.com")
+    job = queue.create_job("job", "requester@example.com", "owner@example.com")
+    queue.move_job(job, JobStatus.approved)
+    # The clock stepped back an hour (DST fall-back, NTP) before the job ran
+    queue.move_job(job, JobStatus.running, now=job.updated_at - timedelta(hours=1))
+
+    loaded = Queue(tmp_path, owner_email="owner@example.com").get_job_by_uid(job.uid)
+
+    assert loaded.status == JobStatus.running
+    assert loaded.started_at == job.started_at